@@ -1,8 +1,13 @@
 import subprocess
 from tempfile import NamedTemporaryFile
-from typing import Dict, List, TypedDict
+from typing import Dict, Iterator, List, Optional, TypedDict, Union
 import os
 import re
+
+import profiling
+from instance import Instance
+from modelBuilder import build_lifetime_rows
+
 class SolutionResult(TypedDict):
     max_time: float
     config_activation_times: List[Dict[str, float]]
@@ -10,8 +15,10 @@ class SolutionResult(TypedDict):
 def solve(
     M: int,
     N: int,
-    sensors: Dict[str, Dict[str, object]],
-    configurations: List[List[str]]
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: List[List[str]],
+    use_pipe: Optional[bool] = None,
+    workdir: Optional[str] = None
 ) -> SolutionResult:
     """
     Solves the sensor scheduling problem using GLPK via CPLEX LP file format.
@@ -19,8 +26,12 @@ def solve(
     Args:
         M: Number of zones (unused)
         N: Number of sensors (unused)
-        sensors: Dictionary mapping sensor IDs to their properties (must include 'life')
+        sensors: Dictionary mapping sensor IDs to their properties (must include 'life'),
+            or an Instance, in which case each configuration is a sequence of sensor indices
         configurations: List of valid configurations (each configuration is a list of sensor IDs)
+        use_pipe: Feed the model to glpsol through stdin instead of a temporary LP file
+            (defaults to stdin when the platform has /dev/stdin)
+        workdir: Directory for temporary files (defaults to /dev/shm when available)
     
     Returns:
         Dictionary containing:
@@ -30,32 +41,70 @@ def solve(
     # Generate CPLEX LP file content
     lp_content = _generate_lp_file(sensors, configurations)
     print("file generated !")
+    if workdir is None:
+        workdir = _default_workdir()
+    if use_pipe is None:
+        use_pipe = os.path.exists(_STDIN)
+
     # Create temporary files
-    with NamedTemporaryFile(mode='w', suffix='.lp', delete=False) as lp_file, \
-         NamedTemporaryFile(mode='w', suffix='.sol', delete=False) as sol_file:
-        
-        lp_file.write(lp_content)
-        lp_file_path = lp_file.name
+    with NamedTemporaryFile(mode='w', suffix='.sol', dir=workdir, delete=False) as sol_file:
         sol_file_path = sol_file.name
+
+    lp_file_path = None
+    if not use_pipe:
+        with NamedTemporaryFile(mode='w', suffix='.lp', dir=workdir, delete=False) as lp_file:
+            lp_file.write(lp_content)
+            lp_file_path = lp_file.name
     
     try:
         # Run GLPK solver
         cmd = [
             'glpsol',
-            '--cpxlp', lp_file_path,
+            '--cpxlp', lp_file_path or _STDIN,
             '--output', sol_file_path
         ]
-        subprocess.run(cmd, check=True, capture_output=True)
+        completed = subprocess.run(
+            cmd,
+            input=lp_content if use_pipe else None,
+            text=True,
+            check=True,
+            capture_output=True
+        )
+        if profiling.enabled:
+            _record_glpk_log(completed.stdout)
         # Parse the solution
         result = _parse_glpk_solution(sol_file_path, configurations)
         
     finally:
         # Clean up temporary files
-        os.unlink(lp_file_path)
+        if lp_file_path is not None:
+            os.unlink(lp_file_path)
         os.unlink(sol_file_path)
     
     return result
 
+_STDIN = '/dev/stdin'
+
+def _default_workdir() -> Optional[str]:
+    """Uses the tmpfs mount when there is one, the system temp dir otherwise."""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+_GLPK_ITERATION_RE = re.compile(r'^[* ]\s*(\d+): obj =', re.MULTILINE)
+_GLPK_TIME_RE = re.compile(r'Time used:\s+([\d.]+) secs')
+
+def _record_glpk_log(log: str) -> None:
+    """Reports the simplex iterations and time printed by glpsol to profiling."""
+    iterations = _GLPK_ITERATION_RE.findall(log)
+    seconds = _GLPK_TIME_RE.search(log)
+    profiling.record_solver(
+        'GLPK',
+        int(iterations[-1]) if iterations else 0,
+        float(seconds.group(1)) if seconds else 0.0
+    )
+
 def _generate_lp_file(sensors: Dict[str, Dict[str, object]], 
                      configurations: List[List[str]]) -> str:
     """Generates CPLEX LP format string for the problem."""
@@ -67,13 +116,9 @@ def _generate_lp_file(sensors: Dict[str, Dict[str, object]],
     
     # Constraints
     lines.append("Subject To")
-    for sensor_id, sensor_data in sensors.items():
-        terms = []
-        for i, config in enumerate(configurations):
-            if sensor_id in config:
-                terms.append(f"t{i}")
-        if terms:
-            lines.append(f"    {' + '.join(terms)} <= {sensor_data['life']}")
+    for sensor_id, columns, life in build_lifetime_rows(sensors, configurations):
+        terms = [f"t{i}" for i in columns]
+        lines.append(f"    {' + '.join(terms)} <= {life}")
     
     # Variable bounds
     lines.append("Bounds")
@@ -85,29 +130,58 @@ def _generate_lp_file(sensors: Dict[str, Dict[str, object]],
 
 def _parse_glpk_solution(sol_file_path: str, 
                          configurations: List[List[str]]) -> SolutionResult:
-    """Parses GLPK solution file."""
-    with open(sol_file_path, 'r') as f:
-        content = f.read()
+    """
+    Parses GLPK solution file in a single pass: the objective is read from
+    the header and the column section is streamed into an index -> value array.
+    """
+    max_time = 0.0
+    times = [0.0] * len(configurations)
 
-    # Extract objective value
-    obj_match = re.search(r'Objective:\s+obj\s+=\s+([-\d.]+)', content)
-    max_time = float(obj_match.group(1)) if obj_match else 0.0
+    with open(sol_file_path, 'r') as f:
+        for line in f:
+            # Extract objective value
+            if line.startswith('Objective:'):
+                obj_match = _OBJECTIVE_RE.search(line)
+                if obj_match:
+                    max_time = float(obj_match.group(1))
+            elif 'Column name' in line:
+                _read_columns(f, times)
+                break
 
     # Extract activation times
     config_times = []
     for i, config in enumerate(configurations):
-        var_name = f"t{i}"
-        # Match line with variable name and extract activity value (3rd column)
-        match = re.search(rf"\s+\d+\s+{var_name}\s+\w+\s+([-\d.]+)", content)
-        if match:
-            time = float(match.group(1))
-            if time > 1e-6:
-                config_times.append({
-                    'config': config,
-                    'time': time
-                })
+        time = times[i]
+        if time > 1e-6:
+            config_times.append({
+                'config': config,
+                'time': time
+            })
 
     return {
         'max_time': max_time,
         'config_activation_times': config_times
-    }
\ No newline at end of file
+    }
+
+_OBJECTIVE_RE = re.compile(r'Objective:\s+\S+\s+=\s+([-+\d.eE]+)')
+
+def _read_columns(f: Iterator[str], times: List[float]) -> None:
+    """Reads the column section (after its header line) into times, indexed by t{i}."""
+    next(f, None)  # ------ separator line
+    pending: List[str] = []
+    for line in f:
+        parts = pending + line.split()
+        if not parts:
+            break
+        if len(parts) < 4:
+            # Long names are printed alone, the values follow on the next line
+            pending = parts
+            continue
+        pending = []
+
+        # No. | Column name | St | Activity | ...
+        name, activity = parts[1], parts[3]
+        if name.startswith('t') and name[1:].isdigit():
+            i = int(name[1:])
+            if i < len(times):
+                times[i] = float(activity)
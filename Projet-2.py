@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 from typing import Dict, List, Tuple
-import random
 import time
 import pulp
 
+from configsGeneratorGreedy import construire_configuration_elementaire as construire_avec_gains
+
 # Lecture des données depuis un fichier texte
 def read_data_file(filepath: str) -> Tuple[int, int, Dict[str, Dict[str, object]]]:
     sensors: Dict[str, Dict[str, object]] = {}
@@ -25,29 +26,9 @@ def read_data_file(filepath: str) -> Tuple[int, int, Dict[str, Dict[str, object]
 
 # Construction d'une configuration élémentaire (sans limite de capteurs)
 def construire_configuration_elementaire(M: int, sensors: Dict[str, Dict[str, object]]) -> List[str]:
-    zones_couvertes = set()
-    toutes_les_zones = {f"z{i+1}" for i in range(M)}
-    capteurs_restants = set(sensors.keys())
-    configuration = []
-
-    while zones_couvertes != toutes_les_zones and capteurs_restants:
-        candidats = []
-        for capteur in capteurs_restants:
-            nouvelles_zones = set(sensors[capteur]['coverage']) - zones_couvertes
-            if nouvelles_zones:
-                candidats.append((capteur, len(nouvelles_zones)))
-
-        if not candidats:
-            break
-
-        random.shuffle(candidats)
-        choisi = random.choice(candidats)[0]
-
-        configuration.append(choisi)
-        zones_couvertes.update(sensors[choisi]['coverage'])
-        capteurs_restants.remove(choisi)
-
-    return configuration if zones_couvertes == toutes_les_zones else []
+    # Tirage uniforme parmi les capteurs qui couvrent encore une zone : les candidats sont recalculés à
+    # chaque choix, par un ET sur le masque de chaque capteur (cf. IndexGlouton)
+    return construire_avec_gains(M, sensors, k=None)
 
 # Génération de plusieurs configurations distinctes
 def generer_configurations_elementaires(M: int, N: int, sensors: Dict[str, Dict[str, object]]) -> List[List[str]]:
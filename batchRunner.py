@@ -0,0 +1,198 @@
+import glob
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
+
+from pipeline import GapTracker, generate, solve, solve_streaming
+from presolve import presolve
+from profiling import peak_rss_kb
+from reader import CACHE_SUFFIX, read_data_file
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Développe les motifs glob, sans les caches écrits à côté des instances ;
+    un chemin sans correspondance est gardé tel quel.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(path for path in glob.glob(pattern) if not path.endswith(CACHE_SUFFIX))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
+def run_instance(task: Dict[str, object], on_stage: Optional[Callable[[str], None]] = None) -> Dict[str, object]:
+    """
+    Pipeline complet read -> generate -> solve sur une instance, avec le temps
+    de chaque étape et le pic de mémoire (RSS, Kio) atteint à la fin de chacune,
+    sans les solveurs externes (CBC, glpsol).
+    on_stage, s'il est fourni, est appelé avec le nom de chaque étape au
+    moment où elle commence.
+    """
+    record = dict(task)
+    times = {}
+    memory = {}
+    stage = None
+    start = 0.0
+
+    def begin(name: str) -> None:
+        nonlocal stage, start
+        if stage is not None:
+            times[stage] = time.perf_counter() - start
+            memory[stage] = peak_rss_kb()
+        stage = name
+        if on_stage is not None and name is not None:
+            on_stage(name)
+        start = time.perf_counter()
+
+    begin("read")
+    M, N, sensors = read_data_file(task["instance"], use_cache=task.get("use_cache", True))
+
+    if task.get("time_budget") is not None or task.get("max_batches") is not None:
+        # Génération et résolution entrelacées : le meilleur résultat à l'échéance
+        begin("stream")
+        result, configs = solve_streaming(task["generator"], M, N, sensors, task["solver"], task.get("time_budget"),
+                                          task.get("batch_size", 50), task.get("max_batches"), task["rounds"],
+                                          task["tabu_size"], task["seed"])
+        begin(None)
+        if result is None:
+            raise ValueError("no config found within the budget")
+        record.update(status="ok", max_time=result["max_time"], nb_configs=len(configs), times=times,
+                      peak_rss_kb=memory)
+        return record
+
+    reduced = None
+    if task.get("presolve"):
+        begin("presolve")
+        reduced = presolve(M, N, sensors)
+        record.update(reduced_M=reduced.M, reduced_N=reduced.N)
+
+    begin("generate")
+    tracker = None
+    if task.get("gap") is not None:
+        tracker = GapTracker(M, N, sensors, task["gap"], task.get("gap_every", 20), task["solver"],
+                             restore=reduced.restoreAll if reduced is not None else None)
+    configs = generate(task["generator"], M, N, sensors, task["rounds"], task["tabu_size"], task["seed"],
+                       stop=tracker, presolved=reduced, workers=task.get("workers", 1))
+
+    begin("solve")
+    result = solve(task["solver"], M, N, sensors, configs)
+    begin(None)
+
+    record.update(status="ok", max_time=result["max_time"], nb_configs=len(configs), times=times,
+                  peak_rss_kb=memory)
+    if tracker is not None:
+        record.update(upper_bound=tracker.upper, final_gap=(tracker.upper - result["max_time"]) / tracker.upper
+                      if tracker.upper > 0 else 0.0)
+    return record
+
+
+def _child(connection, task: Dict[str, object]) -> None:
+    # Groupe de processus propre : un dépassement de délai tue aussi le solveur
+    if hasattr(os, "setsid"):
+        os.setsid()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    # Les générateurs écrivent beaucoup sur stdout, réservé ici aux lignes JSON
+    sys.stdout = open(os.devnull, "w")
+    try:
+        # Le nom de chaque étape est envoyé avant l'enregistrement final
+        record = run_instance(task, on_stage=connection.send)
+    except Exception as e:
+        record = dict(task, status="error", error=f"{type(e).__name__}: {e}")
+    connection.send(record)
+    connection.close()
+
+
+def terminate_group(process, grace: float = 2.0) -> None:
+    """
+    Arrête le processus et tout son groupe (solveur compris) : SIGTERM, puis
+    SIGKILL après grace secondes. Les processus de _child, de
+    pipelineWorker et de portfolioSolver transforment SIGTERM en SystemExit,
+    ce qui laisse leurs blocs finally arrêter leurs propres processus et
+    supprimer leurs fichiers temporaires.
+    """
+    _signal_group(process, signal.SIGTERM)
+    process.join(grace)
+    # Le solveur peut survivre au processus Python qui l'a lancé
+    _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+    process.join()
+
+
+def _signal_group(process, signum: int) -> None:
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signum)
+            return
+        except ProcessLookupError:
+            # Groupe pas encore créé par le processus, ou déjà vide
+            pass
+    if process.is_alive():
+        if signum == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+
+
+def run_batch(tasks: List[Dict[str, object]], jobs: int, timeout: float, out: TextIO) -> int:
+    """
+    Exécute les tâches sur au plus jobs processus, un processus par instance,
+    et écrit une ligne JSON par instance dès qu'elle se termine. Une instance
+    qui dépasse timeout secondes est tuée (solveur compris) et rapportée avec
+    le statut "timeout" et l'étape en cours. Renvoie le nombre d'instances en
+    échec.
+    """
+    pending = list(reversed(tasks))
+    running = {}  # connexion -> [processus, tâche, échéance, étape en cours]
+    failures = 0
+
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                task = pending.pop()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                # Pas daemon : une instance peut lancer ses propres processus (portfolio, --workers)
+                process = multiprocessing.Process(target=_child, args=(sender, task))
+                process.start()
+                sender.close()
+                running[receiver] = [process, task, time.monotonic() + timeout if timeout else None, None]
+
+            deadlines = [deadline for _, _, deadline, _ in running.values() if deadline is not None]
+            delay = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait(list(running), timeout=delay)
+
+            finished = []
+            for receiver in ready:
+                process, task, _, _ = running[receiver]
+                try:
+                    record = receiver.recv()
+                except EOFError:
+                    record = dict(task, status="error", error=f"worker exited with code {process.exitcode}")
+                if isinstance(record, str):
+                    running[receiver][3] = record
+                    continue
+                process.join()
+                finished.append((receiver, record))
+
+            now = time.monotonic()
+            for receiver, (process, task, deadline, stage) in running.items():
+                if deadline is not None and now >= deadline and receiver not in ready:
+                    terminate_group(process)
+                    finished.append((receiver, dict(task, status="timeout", timeout=timeout, stage=stage)))
+
+            for receiver, record in finished:
+                del running[receiver]
+                receiver.close()
+                failures += record["status"] != "ok"
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    finally:
+        # Interruption (Ctrl-C...) : les instances en cours et leurs solveurs ne survivent pas au runner
+        for process, _, _, _ in running.values():
+            terminate_group(process)
+
+    return failures
@@ -0,0 +1,315 @@
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+
+from batchRunner import run_batch
+from instanceGenerator import LIFETIMES, OVERLAPS, generateInstance, writeInstance
+from pipeline import GENERATORS, SOLVERS, generate, solve
+from profiling import peak_rss_kb
+from reader import read_data_file
+
+INSTANCES = ["examples/moyen1", "examples/moyen2", "examples/moyen3", "examples/gros1", "examples/maxi1"]
+SIZES = ["250x125", "500x250", "1000x500", "2000x1000", "4000x2000"]
+SCALING_STAGES = ["read", "generate", "solve"]
+
+
+def run_one(task: Dict[str, object]) -> Dict[str, object]:
+    """Exécute read -> generate -> solve dans un processus neuf et mesure chaque étape."""
+    record = dict(task)
+    times = {}
+
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            M, N, sensors = read_data_file(task["instance"], use_cache=False)
+            times["read"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            configs = generate(task["generator"], M, N, sensors, task["rounds"], task["tabu_size"],
+                               task["seed"])
+            times["generate"] = time.perf_counter() - start
+            record["nb_configs"] = len(configs)
+
+            start = time.perf_counter()
+            result = solve(task["solver"], M, N, sensors, configs)
+            times["solve"] = time.perf_counter() - start
+            record["max_time"] = result["max_time"]
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    times["total"] = sum(times.values())
+    record["times"] = times
+    record["peak_rss_kb"] = peak_rss_kb()
+    return record
+
+
+def run_isolated(task: Dict[str, object]) -> Dict[str, object]:
+    """
+    run_one dans un processus neuf, pour que le pic de RSS mesuré soit celui
+    du run seul. Le processus n'est pas daemon : le solveur portfolio peut y
+    lancer ses propres processus.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_run_child, args=(sender, task))
+    process.start()
+    sender.close()
+    try:
+        record = receiver.recv()
+    except EOFError:
+        record = None
+    receiver.close()
+    process.join()
+    if record is None:
+        record = dict(task, error=f"worker exited with code {process.exitcode}", times={"total": 0.0})
+    return record
+
+
+def _run_child(connection, task: Dict[str, object]) -> None:
+    connection.send(run_one(task))
+    connection.close()
+
+
+def run(args) -> None:
+    tasks = [
+        {
+            "instance": instance,
+            "generator": generator,
+            "solver": solver,
+            "seed": seed,
+            "repeat": repeat,
+            "rounds": args.rounds,
+            "tabu_size": args.tabu_size,
+        }
+        for instance in args.instances
+        for generator in args.generators
+        for solver in args.solvers
+        for seed in args.seeds
+        for repeat in range(args.repeat)
+    ]
+
+    records = []
+    for task in tasks:
+        record = run_isolated(task)
+        records.append(record)
+        status = record.get("error") or f"max_time={record['max_time']:.4f}"
+        print(f"{record['instance']} {record['generator']} {record['solver']} "
+              f"seed={record['seed']} #{record['repeat']} : "
+              f"{record['times']['total']:.3f}s, {status}")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "runs": records,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"{len(records)} runs written to {args.output}")
+
+
+def summarize(runs: List[Dict[str, object]]) -> Dict[tuple, Dict[str, float]]:
+    """Médiane du temps total et moyenne de max_time par (instance, générateur, solveur)."""
+    groups: Dict[tuple, List[Dict[str, object]]] = {}
+    for record in runs:
+        if "error" in record:
+            continue
+        key = (record["instance"], record["generator"], record["solver"])
+        groups.setdefault(key, []).append(record)
+
+    return {
+        key: {
+            "time": statistics.median(r["times"]["total"] for r in records),
+            "max_time": statistics.mean(r["max_time"] for r in records),
+        }
+        for key, records in groups.items()
+    }
+
+
+def compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = summarize(json.load(f)["runs"])
+    with open(args.current) as f:
+        current = summarize(json.load(f)["runs"])
+
+    regressions = 0
+    for key in sorted(baseline):
+        if key not in current:
+            print(f"{' '.join(key)} : missing from current results")
+            regressions += 1
+            continue
+
+        old, new = baseline[key], current[key]
+        flags = []
+        if new["time"] > old["time"] * (1 + args.time_tolerance):
+            flags.append("TIME")
+        if new["max_time"] < old["max_time"] * (1 - args.quality_tolerance):
+            flags.append("QUALITY")
+        regressions += bool(flags)
+
+        print(f"{' '.join(key)} : time {old['time']:.3f}s -> {new['time']:.3f}s, "
+              f"max_time {old['max_time']:.4f} -> {new['max_time']:.4f}"
+              + (f"  REGRESSION {'/'.join(flags)}" if flags else ""))
+
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    N, M = size.lower().split("x")
+    return int(N), int(M)
+
+
+def scale(args) -> int:
+    """
+    Balayage de tailles sur des instances synthétiques (cf. instanceGenerator) :
+    read -> generate -> solve une fois par taille, générateur et solveur, un
+    processus à la fois pour que les mesures ne se gênent pas. Les
+    enregistrements de batchRunner (temps et pic de RSS par étape) sont écrits
+    en JSON lines dans args.output, puis résumés par une table et l'exposant
+    de chaque étape en fonction de N.
+    """
+    os.makedirs(args.workdir, exist_ok=True)
+    tasks = []
+    missing = []
+    for size in args.sizes:
+        N, M = parse_size(size)
+        path = os.path.join(args.workdir, f"synth-{N}x{M}-{args.overlap}-d{args.density}-{args.lifetimes}-s{args.seed}")
+        if not os.path.exists(path):
+            missing.append((path, N, M, args.density, args.lifetimes, tuple(args.life_range), args.overlap, args.seed))
+        tasks.extend({
+            "instance": path,
+            "N": N,
+            "M": M,
+            "generator": generator,
+            "solver": solver,
+            "seed": args.seed,
+            "rounds": args.rounds,
+            "tabu_size": args.tabu_size,
+            "use_cache": False,
+        } for generator in args.generators for solver in args.solvers)
+
+    # Génération hors du processus principal : les runs, forkés depuis lui, n'héritent pas de sa mémoire
+    with Pool(1) as pool:
+        pool.starmap(write_synthetic, missing)
+
+    with open(args.output, "w") as out:
+        failures = run_batch(tasks, 1, args.timeout, out)
+    with open(args.output) as f:
+        records = [json.loads(line) for line in f]
+
+    print_scaling(records)
+    print(f"{len(records)} runs written to {args.output}, {failures} failed")
+    return 0
+
+
+def write_synthetic(path: str, N: int, M: int, density: float, lifetimes: str, lifeRange: Tuple[int, int],
+                    overlap: str, seed: int) -> None:
+    writeInstance(generateInstance(N, M, density, lifetimes, lifeRange, overlap, seed=seed), path)
+
+
+def print_scaling(records: List[Dict[str, object]]) -> None:
+    """
+    Table temps / pic de RSS par taille, puis exposant k de chaque étape
+    (temps ~ N^k). Avec M proportionnel à N, comme dans SIZES, la taille du
+    fichier croît comme N^2.
+    """
+    groups: Dict[tuple, List[Dict[str, object]]] = {}
+    for record in records:
+        groups.setdefault((record["generator"], record["solver"]), []).append(record)
+
+    for (generator, solver), runs in groups.items():
+        print(f"\n{generator} / {solver}")
+        print(f"{'N x M':<14}" + "".join(f"{stage + ' (s)':>14}" for stage in SCALING_STAGES)
+              + f"{'RSS (Mio)':>12}  status")
+        for record in sorted(runs, key=lambda r: r["N"]):
+            times = record.get("times", {})
+            memory = record.get("peak_rss_kb", {})
+            status = record["status"]
+            if status == "timeout":
+                status += f" ({record.get('stage')})"
+            elif status == "error":
+                status = record["error"]
+            print(f"{record['N']} x {record['M']:<8}"
+                  + "".join(f"{times[stage]:>14.4f}" if stage in times else f"{'-':>14}" for stage in SCALING_STAGES)
+                  + (f"{max(memory.values()) / 1024:>12.1f}" if memory else f"{'-':>12}")
+                  + f"  {status}")
+
+        exponents = []
+        for stage in SCALING_STAGES:
+            points = [(r["N"], r["times"][stage]) for r in runs if stage in r.get("times", {}) and r["times"][stage] > 0]
+            k = fit_exponent(points)
+            exponents.append(f"{stage} {k:.2f}" if k is not None else f"{stage} -")
+        print("exponent (time ~ N^k) : " + ", ".join(exponents))
+
+
+def fit_exponent(points: List[Tuple[int, float]]) -> Optional[float]:
+    """Pente des moindres carrés de log(temps) en fonction de log(N) ; None avec moins de deux tailles."""
+    if len({n for n, _ in points}) < 2:
+        return None
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mx = statistics.mean(xs)
+    my = statistics.mean(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark des générateurs et solveurs sur examples/ et sur des instances synthétiques")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="exécute les benchmarks et écrit un fichier JSON")
+    run_parser.add_argument("--instances", nargs="+", default=INSTANCES)
+    run_parser.add_argument("--generators", nargs="+", choices=GENERATORS, default=GENERATORS)
+    run_parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=SOLVERS)
+    run_parser.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3])
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--rounds", type=int, default=100)
+    run_parser.add_argument("--tabu-size", type=int, default=10)
+    run_parser.add_argument("--output", default="bench_results.json")
+
+    compare_parser = commands.add_parser("compare", help="compare deux fichiers de résultats")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--time-tolerance", type=float, default=0.2,
+                                help="hausse relative du temps tolérée (0.2 = +20%%)")
+    compare_parser.add_argument("--quality-tolerance", type=float, default=1e-6,
+                                help="baisse relative de max_time tolérée")
+
+    scale_parser = commands.add_parser("scale", help="balaye des tailles d'instances synthétiques, temps et mémoire par étape")
+    scale_parser.add_argument("--sizes", nargs="+", default=SIZES, metavar="NxM",
+                              help="tailles (capteurs x zones) à balayer")
+    scale_parser.add_argument("--density", type=float, default=0.5)
+    scale_parser.add_argument("--lifetimes", choices=LIFETIMES, default="uniform")
+    scale_parser.add_argument("--life-range", type=int, nargs=2, default=[1, 200], metavar=("MIN", "MAX"))
+    scale_parser.add_argument("--overlap", choices=OVERLAPS, default="random")
+    scale_parser.add_argument("--generators", nargs="+", choices=GENERATORS, default=["random", "tabou"])
+    scale_parser.add_argument("--solvers", nargs="+", choices=SOLVERS, default=["pulp"])
+    scale_parser.add_argument("--seed", type=int, default=1)
+    scale_parser.add_argument("--rounds", type=int, default=100)
+    scale_parser.add_argument("--tabu-size", type=int, default=10)
+    scale_parser.add_argument("--timeout", type=float, default=300, help="délai maximal par run (secondes)")
+    scale_parser.add_argument("--workdir", default="synthetic", help="répertoire des instances générées")
+    scale_parser.add_argument("--output", default="scaling_results.jsonl")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+        return 0
+    if args.command == "scale":
+        return scale(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,157 @@
+import argparse
+import os
 import sys
+from contextlib import nullcontext
 
-from configsGeneratorRandom import generateConfigsRandom
+import profiling
+from batchRunner import expand_inputs, run_batch
+from pipeline import GENERATORS, SOLVERS, GapTracker, generate, get_solver, solve_streaming
+from presolve import presolve
 from reader import read_data_file
+from resultCache import ResultCache
+from util import validatePool
 
 
 if __name__ == "__main__" :
 
-    pathToFile = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Génère les configurations élémentaires d'une instance")
+    parser.add_argument("pathToFile", nargs="+",
+                        help="fichier d'instance ; plusieurs fichiers ou motifs glob avec --batch")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="rounds de génération (100 par défaut, sans limite avec --time-budget)")
+    parser.add_argument("--solver", choices=SOLVERS, default=None,
+                        help="résout le LP sur les configurations générées")
+    parser.add_argument("--colgen-time", type=float, default=None, metavar="SEC",
+                        help="budget de --solver colgen, génération de colonnes comprise (10 s par défaut)")
+    parser.add_argument("--batch", action="store_true",
+                        help="read -> generate -> solve sur chaque instance en parallèle, une ligne JSON par instance")
+    parser.add_argument("--generator", choices=GENERATORS, default="random")
+    parser.add_argument("--tabu-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processus de génération (random : rounds répartis, tabou : trajectoires multi-départ)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[None], help="une exécution par graine avec --batch ; la graine du run avec --cache (obligatoire)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="processus simultanés avec --batch")
+    parser.add_argument("--timeout", type=float, default=None, help="délai maximal par instance (secondes)")
+    parser.add_argument("--output", default=None, help="fichier JSON lines de --batch (stdout par défaut)")
+    parser.add_argument("--presolve", action="store_true",
+                        help="réduit l'instance (zones équivalentes ou impliquées, capteurs obligatoires) avant la génération")
+    parser.add_argument("--gap", type=float, default=None, metavar="TOL",
+                        help="arrête la génération dès que l'écart relatif au majorant est inférieur à TOL")
+    parser.add_argument("--gap-every", type=int, default=20, help="rounds entre deux mesures de l'écart")
+    parser.add_argument("--time-budget", type=float, default=None, metavar="SEC",
+                        help="génère et résout par lots jusqu'à l'échéance, puis garde le meilleur résultat")
+    parser.add_argument("--batch-size", type=int, default=50, help="configurations par lot avec --time-budget")
+    parser.add_argument("--max-batches", type=int, default=None, help="nombre maximal de lots résolus")
+    parser.add_argument("--verbose", action="store_true", help="affiche chaque configuration générée")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="DIR",
+                        help="réutilise les configurations et résultats d'un run identique (~/.cache/capteurs par défaut)")
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="JSON",
+                        help="mesure chaque étape ; affiche un tableau, ou écrit le JSON dans le fichier donné")
+    parser.add_argument("--hotspots", default=None, metavar="FILE",
+                        help="profile la génération (cProfile, ou pyinstrument si FILE finit par .html)")
+    args = parser.parse_args()
 
-    M, N, sensors = read_data_file(pathToFile)
+    if args.colgen_time is not None :
+        import columnGeneration
+        columnGeneration.TIME_LIMIT = args.colgen_time
+
+    streaming = args.time_budget is not None or args.max_batches is not None
+    if args.rounds is None :
+        # Sans échéance, un générateur sans limite de rounds peut ne jamais remplir de lot
+        args.rounds = None if args.time_budget is not None else 100
+    if streaming and (args.presolve or args.gap is not None or args.cache is not None or args.workers > 1) :
+        parser.error("--time-budget et --max-batches ne se combinent pas avec --presolve, --gap, --cache ni --workers")
+
+    if args.batch :
+        tasks = [
+            {
+                "instance": instance,
+                "generator": args.generator,
+                "solver": args.solver or "pulp",
+                "seed": seed,
+                "rounds": args.rounds,
+                "tabu_size": args.tabu_size,
+                "workers": args.workers,
+                "gap": args.gap,
+                "gap_every": args.gap_every,
+                "presolve": args.presolve,
+                "time_budget": args.time_budget,
+                "batch_size": args.batch_size,
+                "max_batches": args.max_batches,
+            }
+            for instance in expand_inputs(args.pathToFile)
+            for seed in args.seeds
+        ]
+        with (open(args.output, "w") if args.output else nullcontext(sys.stdout)) as out :
+            failures = run_batch(tasks, max(1, args.jobs), args.timeout, out)
+        sys.exit(1 if failures else 0)
+
+    if len(args.pathToFile) > 1 :
+        parser.error("plusieurs instances demandent --batch")
+
+    if streaming :
+        M, N, sensors = read_data_file(args.pathToFile[0])
+        report = lambda r,n,t : print(f"{t:8.3f}s  configs : {n}  max_time : {r['max_time']:.4f}")
+        result, solved = solve_streaming(args.generator,M,N,sensors,args.solver or "pulp",args.time_budget,
+                                         args.batch_size,args.max_batches,args.rounds,args.tabu_size,
+                                         on_batch=report)
+        if args.verbose :
+            print("solved : ",solved)
+        print("result : ",result)
+        sys.exit(0)
+
+    if args.cache is not None :
+        if args.presolve or args.gap is not None :
+            parser.error("--cache ne se combine pas avec --presolve ni --gap")
+        if len(args.seeds) != 1 or args.seeds[0] is None :
+            parser.error("--cache demande une seule graine (--seeds N) : sans graine le run n'est pas reproductible")
+        cache = ResultCache(args.cache or None)
+        solved, result, origin = cache.run(args.pathToFile[0],args.generator,args.solver or "pulp",
+                                           args.rounds,args.tabu_size,args.seeds[0],args.workers)
+        print("cache : ",origin)
+        print("solved : ",solved)
+        print("result : ",result)
+        sys.exit(0)
+
+    if args.profile is not None :
+        profiling.enable()
+
+    with profiling.stage("read") :
+        M, N, sensors = read_data_file(args.pathToFile[0])
 
     print("M : ",M,", N : ",N,", sensors : ",sensors)
 
-    solved = generateConfigsRandom(M,N,sensors)
+    reduced = None
+    if args.presolve :
+        with profiling.stage("presolve") :
+            reduced = presolve(M,N,sensors)
+        print("presolve : ",reduced.summary())
+
+    stop = None
+    if args.gap is not None :
+        report = lambda e : print(f"configs : {e['configs']}, lower : {e['lower']:.4f}, "
+                                  f"upper : {e['upper']:.4f}, gap : {e['gap']:.2%}")
+        stop = GapTracker(M,N,sensors,args.gap,args.gap_every,args.solver or "pulp",report,
+                          reduced.restoreAll if reduced is not None else None)
+
+    with profiling.stage("generate"), (profiling.hotspots(args.hotspots) if args.hotspots else nullcontext()) :
+        solved = generate(args.generator,M,N,sensors,args.rounds,args.tabu_size,stop=stop,presolved=reduced,
+                          verbose=args.verbose,workers=args.workers)
+
+    print("solved : ",solved)
+
+    with profiling.stage("validate") :
+        report = validatePool(M,sensors,solved)
+    if not report.valid :
+        print("non elementary configs : ",report.describe(solved))
+
+    if args.solver is not None :
+        solve = get_solver(args.solver)
+        with profiling.stage("solve") :
+            result = solve(M,N,sensors,solved)
+        print("result : ",result)
 
-    print("solved : ",solved)
\ No newline at end of file
+    if args.profile == "-" :
+        profiling.print_summary()
+    elif args.profile is not None :
+        profiling.write_json(args.profile)
@@ -0,0 +1,190 @@
+import time
+from typing import Dict, List, Optional, Union
+
+import pulp as pl
+
+from configsGeneratorRandom import generateElementary
+from instance import Instance
+from pulpSolver import SolutionResult, SolverSession
+from util import coverageIndex
+
+EPSILON = 1e-6
+# Budget par défaut de solve (secondes)
+TIME_LIMIT = 10.0
+
+
+def solve(
+    M: int,
+    N: int,
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: List[List[str]]
+) -> SolutionResult:
+    """
+    Backend "colgen" du registre de pipeline : génération de colonnes à
+    partir des configurations données, dans la limite de TIME_LIMIT secondes.
+    """
+    return solveColumnGeneration(M, N, sensors, configurations, timeLimit=TIME_LIMIT)
+
+
+def solveColumnGeneration(
+    M: int,
+    N: int,
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: Optional[List[List[str]]] = None,
+    maxIterations: int = 1000,
+    columnsPerIteration: int = 10,
+    timeLimit: Optional[float] = None,
+    verbose: bool = False
+) -> SolutionResult:
+    """
+    Résout le problème d'ordonnancement par génération de colonnes.
+
+    À chaque itération, le LP maître restreint est résolu sur les
+    configurations connues, puis le sous-problème de pricing cherche la
+    couverture de poids dual minimal (heuristique gloutonne, puis PLNE exacte
+    si l'heuristique échoue). Toute couverture de coût réduit positif
+    (1 - somme des duaux > 0) est ajoutée comme nouvelle colonne. La boucle
+    s'arrête quand le pricing exact n'en trouve plus : la valeur renvoyée est
+    alors l'optimum du LP sur l'ensemble des configurations élémentaires.
+
+    Le LP maître reste ouvert dans une pulpSolver.SolverSession : chaque
+    itération ne fait qu'ajouter ses colonnes, et CBC repart de la base de la
+    résolution précédente.
+
+    Args:
+        M, N, sensors: instance telle que renvoyée par read_data_file, ou une
+            Instance (configurations en indices de capteurs)
+        configurations: colonnes initiales (par défaut une configuration aléatoire)
+        maxIterations: nombre maximal de résolutions du LP maître
+        columnsPerIteration: nombre maximal de colonnes ajoutées par itération
+        timeLimit: budget en secondes (sans limite si None), pricing exact
+            compris ; une fois dépassé, la dernière solution du LP maître est
+            renvoyée, et sa valeur ne fait que minorer l'optimum
+        verbose: affiche la progression de chaque itération
+
+    Returns:
+        Le même SolutionResult que pulpSolver.solve
+    """
+    native = isinstance(sensors, Instance)
+    if native:
+        instance = sensors
+        sensors = instance.sensors()
+        configurations = [Instance.toSensorIds(c) for c in configurations] if configurations else None
+
+    deadline = time.monotonic() + timeLimit if timeLimit is not None else None
+    index = coverageIndex(M, sensors)
+    columns = [list(c) for c in configurations] if configurations else [sorted(generateElementary(M, N, sensors))]
+    seen = {tuple(sorted(c)) for c in columns}
+
+    with SolverSession(M, N, sensors, columns) as session:
+        for iteration in range(maxIterations):
+            result = session.resolve()
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            duals = session.duals()
+
+            newColumns = _priceHeuristic(index, duals, columnsPerIteration)
+            newColumns = [c for c in newColumns if tuple(c) not in seen]
+            if not newColumns:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                column = _priceExact(index, duals, remaining)
+                if column is None or tuple(column) in seen:
+                    break
+                newColumns = [column]
+
+            if verbose:
+                best = max(1 - _weight(c, duals) for c in newColumns)
+                print(f"iteration {iteration} : max_time = {result['max_time']}, "
+                      f"best reduced cost = {best}, columns = {len(columns)}")
+
+            columns.extend(newColumns)
+            seen.update(tuple(c) for c in newColumns)
+            session.add_columns(newColumns)
+        else:
+            result = session.resolve()
+
+    if native:
+        for entry in result["config_activation_times"]:
+            entry["config"] = Instance.fromSensorIds(entry["config"])
+    return result
+
+
+def _weight(config: List[str], duals: Dict[str, float]) -> float:
+    return sum(duals[s] for s in config)
+
+
+def _priceHeuristic(index, duals: Dict[str, float], count: int) -> List[List[str]]:
+    """
+    Couvertures gloutonnes pondérées (ratio dual / zones nouvellement couvertes).
+    Après chaque couverture trouvée, le poids de ses capteurs est pénalisé pour
+    que la suivante explore d'autres capteurs ; seules les couvertures de coût
+    réduit positif pour les vrais duaux sont renvoyées.
+    """
+    weights = dict(duals)
+    found = []
+    seen = set()
+
+    for _ in range(count):
+        chosen = _greedyCover(index, weights)
+        if chosen is None:
+            break
+
+        chosen = sorted(index.makeElementary(chosen, key=lambda s: duals[s]))
+        if tuple(chosen) not in seen and _weight(chosen, duals) < 1 - EPSILON:
+            found.append(chosen)
+            seen.add(tuple(chosen))
+
+        for s in chosen:
+            weights[s] = weights[s] * 2 + EPSILON
+
+    return found
+
+
+def _greedyCover(index, weights: Dict[str, float]) -> Optional[List[str]]:
+    remaining = index.full
+    chosen = []
+
+    while remaining:
+        best = None
+        bestRatio = None
+        for s, mask in index.masks.items():
+            gain = (mask & remaining).bit_count()
+            if gain == 0:
+                continue
+            ratio = weights[s] / gain
+            if bestRatio is None or ratio < bestRatio:
+                best, bestRatio = s, ratio
+
+        if best is None:
+            return None
+
+        chosen.append(best)
+        remaining &= ~index.masks[best]
+
+    return chosen
+
+
+def _priceExact(index, duals: Dict[str, float], timeLimit: Optional[float] = None) -> Optional[List[str]]:
+    """
+    Couverture de poids dual minimal par PLNE (CBC). Avec timeLimit, CBC
+    renvoie la meilleure couverture trouvée dans ce délai.
+    """
+    prob = pl.LpProblem("Pricing", pl.LpMinimize)
+    x = {s: pl.LpVariable(f"x_{s}", cat=pl.LpBinary) for s in index.masks}
+    prob += pl.lpSum(duals[s] * x[s] for s in index.masks), "DualWeight"
+
+    for zone in range(index.M):
+        bit = 1 << zone
+        covering = [x[s] for s, mask in index.masks.items() if mask & bit]
+        prob += pl.lpSum(covering) >= 1, f"Cover_z{zone + 1}"
+
+    limit = max(timeLimit, 1.0) if timeLimit is not None else None
+    status = prob.solve(pl.PULP_CBC_CMD(msg=False, timeLimit=limit))
+    if status != pl.LpStatusOptimal:
+        return None
+
+    chosen = [s for s in index.masks if (x[s].value() or 0) > 0.5]
+    chosen = index.makeElementary(chosen, key=lambda s: duals[s])
+    if _weight(chosen, duals) < 1 - EPSILON:
+        return sorted(chosen)
+    return None
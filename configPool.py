@@ -0,0 +1,123 @@
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+_MAGIC = b"CFGP"
+_HEADER = struct.Struct("<4sII")
+
+
+class ConfigPool:
+    """
+    Ensemble de configurations stockées sous forme canonique.
+
+    Chaque configuration est un masque de bits sur les capteurs (bit i-1 pour
+    le capteur s{i}) ; un dictionnaire masque -> position permet l'insertion
+    sans doublon en O(1). Avec rejectSupersets, une configuration contenant
+    entièrement une configuration déjà présente est refusée.
+    """
+
+    def __init__(self, N: int, rejectSupersets: bool = False):
+        self.N = N
+        self.rejectSupersets = rejectSupersets
+        self.masks: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    @staticmethod
+    def toMask(config: Iterable[str]) -> int:
+        mask = 0
+        for s in config:
+            mask |= 1 << (int(s[1:]) - 1)
+        return mask
+
+    @staticmethod
+    def idsToMask(config: Iterable[int]) -> int:
+        """Masque d'une configuration d'indices de capteurs (cf. instance.Instance)."""
+        mask = 0
+        for i in config:
+            mask |= 1 << i
+        return mask
+
+    @staticmethod
+    def toConfig(mask: int) -> List[str]:
+        config = []
+        while mask:
+            low = mask & -mask
+            config.append(f"s{low.bit_length()}")
+            mask ^= low
+        return config
+
+    def add(self, config: Iterable[str]) -> bool:
+        """Ajoute la configuration si elle est nouvelle ; renvoie True si elle a été ajoutée."""
+        return self.addMask(self.toMask(config))
+
+    def addMask(self, mask: int) -> bool:
+        if mask in self.positions:
+            return False
+
+        if self.rejectSupersets:
+            for other in self.masks:
+                if other & mask == other:
+                    return False
+
+        self.positions[mask] = len(self.masks)
+        self.masks.append(mask)
+        return True
+
+    def update(self, configs: Iterable[Iterable[str]]) -> int:
+        """Ajoute plusieurs configurations ; renvoie le nombre de nouvelles."""
+        return sum(1 for config in configs if self.add(config))
+
+    def __contains__(self, config: Iterable[str]) -> bool:
+        return self.toMask(config) in self.positions
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for mask in self.masks:
+            yield self.toConfig(mask)
+
+    def configs(self) -> List[List[str]]:
+        return list(self)
+
+    def csr(self) -> Tuple[array, array]:
+        """
+        Vue CSR de l'incidence configuration x capteur : les capteurs de la
+        configuration j sont indices[indptr[j]:indptr[j+1]] (indices à partir de 0).
+        C'est aussi la matrice capteur x configuration des contraintes de durée
+        de vie au format CSC, que highsSolver passe telle quelle à HiGHS.
+        """
+        indptr = array("l", [0])
+        indices = array("l")
+        for mask in self.masks:
+            while mask:
+                low = mask & -mask
+                indices.append(low.bit_length() - 1)
+                mask ^= low
+            indptr.append(len(indices))
+        return indptr, indices
+
+    def save(self, filepath: str) -> None:
+        """Écrit le pool dans un fichier binaire : en-tête puis un masque de taille fixe par configuration."""
+        width = (self.N + 7) // 8
+        with open(filepath, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.N, len(self.masks)))
+            for mask in self.masks:
+                f.write(mask.to_bytes(width, "little"))
+
+    @classmethod
+    def load(cls, filepath: str, rejectSupersets: bool = False) -> "ConfigPool":
+        with open(filepath, "rb") as f:
+            magic, N, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{filepath} n'est pas un fichier de configurations")
+            width = (N + 7) // 8
+            data = f.read(width * count)
+
+        if len(data) != width * count:
+            raise ValueError(f"{filepath} est tronqué : {count} configurations attendues")
+
+        pool = cls(N, rejectSupersets)
+        for i in range(count):
+            pool.addMask(int.from_bytes(data[i * width:(i + 1) * width], "little"))
+        return pool
@@ -0,0 +1,165 @@
+import time
+from array import array
+from typing import Iterator, Optional
+
+from configsGeneratorRandom import generateConfigsRandom, iterConfigsRandom
+from configPool import ConfigPool
+from instance import Instance
+from util import instanceOf
+
+MAX_CONFIGS = 20000
+TIME_LIMIT = 5.0
+
+def generateConfigsExact(M,N,sensors,maxConfigs = MAX_CONFIGS,timeLimit = TIME_LIMIT,fallbackRounds = 100,seed = None,
+                         stop = None,verbose = False):
+    """
+    Énumère toutes les configurations élémentaires de l'instance (cf.
+    iterElementaryCovers) : le LP résolu dessus donne la durée optimale.
+
+    Si l'énumération atteint maxConfigs configurations ou timeLimit secondes
+    (None : sans limite), elle s'arrête et les configurations déjà trouvées
+    sont complétées par fallbackRounds rounds du générateur aléatoire.
+
+    stop, s'il est fourni, est appelé après chaque configuration avec la
+    liste des configurations trouvées ; la génération s'arrête dès qu'il
+    renvoie True, sans repli sur le générateur aléatoire.
+
+    Si sensors est une Instance, les configurations renvoyées sont des
+    array('i') d'indices de capteurs au lieu de listes de "s{i}".
+    """
+    native = isinstance(sensors, Instance)
+    instance = instanceOf(M,sensors)
+    deadline = time.monotonic() + timeLimit if timeLimit is not None else None
+
+    configs = []
+    covers = iterElementaryCovers(instance,deadline)
+    complete = True
+    stopped = False
+    for ids in covers :
+        configs.append(ids if native else Instance.toSensorIds(ids))
+        if stop is not None and stop(configs) :
+            stopped = True
+            break
+        if maxConfigs is not None and len(configs) >= maxConfigs :
+            # Complète seulement s'il n'en restait pas d'autre
+            complete = next(covers,None) is None
+            break
+    complete = complete and not _expired(deadline)
+    found = len(configs)
+
+    if not complete and not stopped :
+        pool = ConfigPool(N)
+        for c in configs :
+            pool.addMask(ConfigPool.idsToMask(c) if native else ConfigPool.toMask(c))
+        configs += generateConfigsRandom(M,N,sensors,fallbackRounds,seed = seed,pool = pool)
+
+    if verbose :
+        print(f"{found} configurations élémentaires énumérées"
+              + ("" if complete else f" (limite atteinte, {len(configs) - found} ajoutées par le générateur aléatoire)"))
+
+    return configs
+
+def iterConfigsExact(M,N,sensors,maxConfigs = MAX_CONFIGS,rounds = None,seed = None,deadline = None) -> Iterator:
+    """
+    Version paresseuse de generateConfigsExact : produit les configurations
+    élémentaires au fil de l'énumération, puis, si maxConfigs est atteint,
+    continue avec iterConfigsRandom (rounds rounds, sans limite si None).
+    S'arrête dès que time.monotonic() atteint deadline.
+    """
+    native = isinstance(sensors, Instance)
+    pool = ConfigPool(N)
+    count = 0
+    for ids in iterElementaryCovers(instanceOf(M,sensors),deadline) :
+        if maxConfigs is not None and count >= maxConfigs :
+            yield from iterConfigsRandom(M,N,sensors,rounds,seed = seed,pool = pool,deadline = deadline)
+            return
+        pool.addMask(ConfigPool.idsToMask(ids))
+        count += 1
+        yield ids if native else Instance.toSensorIds(ids)
+
+def iterElementaryCovers(instance,deadline = None) -> Iterator[array]:
+    """
+    Produit chaque configuration élémentaire (couverture minimale) de
+    l'instance exactement une fois, en indices de capteurs.
+
+    Recherche en profondeur avec séparation sur les zones : à chaque nœud,
+    la zone non couverte ayant le moins de capteurs encore autorisés est
+    choisie ; la branche i ajoute son i-ème capteur et interdit les
+    précédents, de sorte qu'aucune couverture n'est produite deux fois.
+    Élagages :
+    - une zone non couverte sans capteur autorisé : branche infaisable,
+      abandonnée dès que le parcours des zones la rencontre ;
+    - un capteur choisi qui n'est plus seul à couvrir aucune zone : la
+      branche ne peut donner que des couvertures non minimales (ajouter des
+      capteurs ne rend jamais une zone à nouveau couverte une seule fois).
+    L'énumération s'arrête quand time.monotonic() atteint deadline.
+    """
+    masks = instance.masks
+    full = instance.full
+
+    # Capteurs couvrant chaque zone, bit i pour le capteur i
+    coveredBy = [0] * instance.M
+    for i, mask in enumerate(masks):
+        while mask:
+            low = mask & -mask
+            coveredBy[low.bit_length() - 1] |= 1 << i
+            mask ^= low
+
+    allSensors = (1 << instance.N) - 1
+    # Nœud : (capteurs choisis, zones couvertes au moins une fois, au moins deux fois, capteurs autorisés)
+    stack = [((), 0, 0, allSensors)]
+    nodes = 0
+
+    while stack:
+        nodes += 1
+        if deadline is not None and nodes & 1023 == 0 and time.monotonic() >= deadline:
+            return
+
+        chosen, once, twice, allowed = stack.pop()
+        uncovered = full & ~once
+        if not uncovered:
+            yield array('i', chosen)
+            continue
+
+        # Zone non couverte la plus contrainte
+        bestCandidates = 0
+        bestCount = None
+        bits = uncovered
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            candidates = coveredBy[low.bit_length() - 1] & allowed
+            count = candidates.bit_count()
+            if bestCount is None or count < bestCount:
+                bestCandidates, bestCount = candidates, count
+                if not count:
+                    break
+
+        if not bestCandidates:
+            continue
+
+        children = []
+        excluded = 0
+        while bestCandidates:
+            low = bestCandidates & -bestCandidates
+            bestCandidates ^= low
+            s = low.bit_length() - 1
+            mask = masks[s]
+            childAllowed = allowed & ~excluded & ~low
+            excluded |= low
+
+            # Seuls les capteurs couvrant une zone qui cesse d'être unique peuvent devenir redondants
+            lost = once & ~twice & mask
+            childTwice = twice | lost
+            childOnce = once | mask
+            if lost:
+                unique = childOnce & ~childTwice
+                if not all(masks[c] & unique for c in chosen):
+                    continue
+            children.append((chosen + (s,), childOnce, childTwice, childAllowed))
+
+        # Dans l'ordre des capteurs : le premier candidat est exploré en premier
+        stack.extend(reversed(children))
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
@@ -0,0 +1,167 @@
+import heapq
+import random
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional
+
+from instance import Instance
+from util import coverageIndex
+
+# Constructions consécutives sans nouvelle configuration après lesquelles la version paresseuse s'arrête
+MAX_ECHECS = 1000
+
+
+class IndexGlouton:
+    """
+    Index de l'instance pour la construction gloutonne : masque de couverture
+    de chaque capteur (cf. util.CoverageIndex), durées de vie, et tas initial
+    des scores, déjà trié, que chaque construction copie au lieu de le refaire.
+
+    Si sensors est une Instance, les masques et durées de vie sont repris de
+    ses tableaux et les identifiants sont les indices de capteurs.
+    """
+
+    def __init__(self, M: int, sensors: Dict[str, Dict[str, object]]):
+        couverture = coverageIndex(M, sensors)
+        self.M = M
+        self.full = couverture.full
+        if isinstance(sensors, Instance):
+            self.ids: List = list(range(sensors.N))
+            self.masques: List[int] = list(sensors.masks)
+            self.durees: List[float] = [float(life) for life in sensors.life]
+        else:
+            self.ids = list(sensors.keys())
+            self.masques = [couverture.masks[s] for s in self.ids]
+            self.durees = [float(sensors[s]['life']) for s in self.ids]
+        self.tas_gain = sorted((-m.bit_count(), i) for i, m in enumerate(self.masques) if m)
+        self.tas_pondere = sorted((-m.bit_count() * self.durees[i], i) for i, m in enumerate(self.masques) if m)
+
+
+_dernier_index = None
+
+
+def index_glouton(M: int, sensors: Dict[str, Dict[str, object]]) -> IndexGlouton:
+    """Renvoie l'index de l'instance, recalculé seulement si elle change."""
+    global _dernier_index
+
+    if _dernier_index is None or _dernier_index[0] is not sensors or _dernier_index[1].M != M:
+        _dernier_index = (sensors, IndexGlouton(M, sensors))
+
+    return _dernier_index[1]
+
+
+# Construction d'une configuration élémentaire (une seule)
+def construire_configuration_elementaire(M: int, sensors: Dict[str, Dict[str, object]], k: Optional[int] = 2,
+                                         ponderation_duree: bool = False,
+                                         index: Optional[IndexGlouton] = None) -> List[str]:
+    """
+    Construit une couverture en choisissant à chaque étape un capteur au hasard
+    parmi les k meilleurs candidats (k=None : parmi tous les capteurs qui
+    couvrent encore une zone non couverte).
+
+    Le score d'un capteur est son gain, c'est-à-dire le nombre de zones non
+    couvertes qu'il couvre (gain × durée de vie avec ponderation_duree). Les
+    gains ne font que décroître : le tas garde pour chaque capteur un majorant,
+    et seul un capteur arrivé en tête est réévalué (un ET et un comptage de
+    bits sur son masque). Un capteur dont le score n'a pas changé fait partie
+    des meilleurs ; les autres sont remis dans le tas avec leur nouveau score.
+
+    Avec une Instance, la configuration est une liste d'indices de capteurs.
+    """
+    if index is None:
+        index = index_glouton(M, sensors)
+
+    masques = index.masques
+    non_couvertes = index.full
+    configuration = []
+
+    if k is None:
+        while non_couvertes:
+            candidats = [i for i, m in enumerate(masques) if m & non_couvertes]
+            if not candidats:
+                return []  # échec
+            choisi = random.choice(candidats)
+            configuration.append(index.ids[choisi])
+            non_couvertes &= ~masques[choisi]
+        return configuration
+
+    durees = index.durees if ponderation_duree else None
+    tas = list(index.tas_pondere if ponderation_duree else index.tas_gain)
+
+    while non_couvertes:
+        candidats = []
+        while tas and len(candidats) < k:
+            entree = heapq.heappop(tas)
+            i = entree[1]
+            score = (masques[i] & non_couvertes).bit_count()
+            if durees is not None:
+                score *= durees[i]
+            if score == -entree[0]:
+                candidats.append(entree)
+            elif score:
+                heapq.heappush(tas, (-score, i))
+
+        if not candidats:
+            return []  # échec
+
+        choisi = candidats.pop(random.randrange(len(candidats)))[1]
+        for entree in candidats:
+            heapq.heappush(tas, entree)
+
+        configuration.append(index.ids[choisi])
+        non_couvertes &= ~masques[choisi]
+
+    return configuration
+
+# Génération de plusieurs configurations distinctes avec limite de temps/essais
+def generer_configurations_elementaires(M: int, N: int, sensors: Dict[str, Dict[str, object]], k: Optional[int] = 2,
+                                        ponderation_duree: bool = False,
+                                        stop: Optional[Callable[[List[List[str]]], bool]] = None) -> List[List[str]]:
+    """
+    Construit des configurations distinctes jusqu'à en avoir nb_attendu ou
+    jusqu'à limite_temps. stop, s'il est fourni, est appelé à chaque nouvelle
+    configuration avec la liste courante ; la génération s'arrête dès qu'il
+    renvoie True.
+    """
+    configurations = []
+    nb_attendu = min(5 + (M + N) // 4, 50)
+    limite_temps = min(3 + (M + N) * 0.05, 20)
+
+    for config in iterer_configurations_elementaires(M, N, sensors, k, ponderation_duree,
+                                                     time.monotonic() + limite_temps):
+        configurations.append(config)
+        if len(configurations) >= nb_attendu or (stop is not None and stop(configurations)):
+            break
+
+    return configurations
+
+
+def iterer_configurations_elementaires(M: int, N: int, sensors: Dict[str, Dict[str, object]], k: Optional[int] = 2,
+                                       ponderation_duree: bool = False,
+                                       echeance: Optional[float] = None,
+                                       max_echecs: Optional[int] = MAX_ECHECS) -> Iterator[List[str]]:
+    """
+    Version paresseuse : produit chaque nouvelle configuration dès qu'elle est
+    construite, jusqu'à ce que time.monotonic() atteigne echeance (sans fin si
+    echeance vaut None) ou après max_echecs constructions de suite sans
+    nouvelle configuration (sans limite si None).
+
+    Si sensors est une Instance, les configurations sont des array('i')
+    d'indices de capteurs, comme pour le générateur aléatoire.
+    """
+    natif = isinstance(sensors, Instance)
+    deja_vues = set()
+    index = index_glouton(M, sensors)
+    echecs = 0
+
+    while echeance is None or time.monotonic() < echeance:
+        config = construire_configuration_elementaire(M, sensors, k, ponderation_duree, index)
+        config_tri = tuple(sorted(config))
+        if config and config_tri not in deja_vues:
+            deja_vues.add(config_tri)
+            echecs = 0
+            yield array('i', config) if natif else config
+        else:
+            echecs += 1
+            if max_echecs is not None and echecs >= max_echecs:
+                return
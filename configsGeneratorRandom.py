@@ -1,48 +1,196 @@
 import random
-from typing import Set
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from typing import Iterator, List, Optional, Tuple
 
-from util import coversAll, isElementary
+from configPool import ConfigPool
+from instance import Instance
+from util import instanceOf
 
-def generateConfigsRandom(M,N,sensors,rounds = 100):
+# Rounds consécutifs sans nouvelle configuration après lesquels la version paresseuse s'arrête
+MAX_STALE = 1000
 
-    configs = []
+def generateConfigsRandom(M,N,sensors,rounds = 100,workers = 1,seed = None,pool = None,progress = None,stop = None,
+                          verbose = False):
+    """
+    Génère jusqu'à rounds configurations élémentaires aléatoires distinctes.
 
-    for i in range(rounds):
-        config = generateElementary(M,N,sensors)
-        
-        normalized = sorted(config)
-        if normalized not in [sorted(c) for c in configs]:
-            configs.append(config)
-        
-    for config in configs :
-        print("---------------------------------------------------")
-        print(config)
-        print("covers all ? : ",coversAll(M,N,sensors,config))
-        print("elementary ? : ",isElementary(M,N,sensors,config))
-        print("---------------------------------------------------")
+    Avec workers > 1, les rounds sont répartis sur un pool de processus.
+    Chaque worker reçoit une graine dérivée de seed : pour un même seed et un
+    même nombre de workers, l'ensemble de configurations obtenu est identique.
+
+    Si un ConfigPool est fourni, les configurations qu'il contient déjà sont
+    ignorées et les nouvelles y sont ajoutées ; seules les nouvelles sont renvoyées.
+
+    progress, s'il est fourni, est appelé après chaque round avec le nombre de
+    configurations trouvées (une seule fois à la fin avec workers > 1).
+
+    stop, s'il est fourni, est appelé après chaque round avec la liste des
+    configurations trouvées ; la génération s'arrête dès qu'il renvoie True.
+    Avec workers > 1, il est appelé après chaque nouvelle configuration
+    reçue des workers (dans l'ordre des workers) et les shards pas encore
+    lancés sont annulés quand il renvoie True.
+
+    Si sensors est une Instance, les configurations renvoyées sont des
+    array('i') d'indices de capteurs au lieu de listes de "s{i}".
+
+    verbose affiche chaque configuration avec sa vérification.
+    """
+
+    native = isinstance(sensors, Instance)
+    instance = instanceOf(M,sensors)
+    if pool is None :
+        pool = ConfigPool(N)
+
+    if workers > 1 :
+        configs = []
+
+        with closing(_generateParallel(M,N,sensors,rounds,workers,seed)) as shards :
+            for config in shards :
+                if not pool.add(config) :
+                    continue
+                configs.append(Instance.fromSensorIds(config) if native else config)
+
+                if stop is not None and stop(configs) :
+                    break
+
+        if progress is not None :
+            progress(len(configs))
+    else :
+        configs = []
+
+        for config in _rounds(M,N,sensors,rounds,seed,pool) :
+            if config is not None :
+                configs.append(config)
+
+            if progress is not None :
+                progress(len(configs))
+
+            if stop is not None and stop(configs) :
+                break
+
+    if verbose :
+        for config in configs :
+            ids = config if native else Instance.fromSensorIds(config)
+            print("---------------------------------------------------")
+            print(Instance.toSensorIds(ids))
+            print("covers all ? : ",instance.coversAll(ids))
+            print("elementary ? : ",instance.isElementary(ids))
+            print("---------------------------------------------------")
 
-    print(len(configs))
+        print(len(configs))
 
     return configs
 
-def generateElementary(M,N,sensors):
+def iterConfigsRandom(M,N,sensors,rounds = None,seed = None,pool = None,deadline = None,
+                      maxStale = MAX_STALE) -> Iterator:
+    """
+    Version paresseuse de generateConfigsRandom : produit chaque nouvelle
+    configuration dès qu'elle est trouvée. S'arrête après rounds rounds
+    (sans limite si None), dès que time.monotonic() atteint deadline, ou
+    après maxStale rounds de suite sans nouvelle configuration (instance
+    épuisée ; sans limite si None).
+    """
+    stale = 0
+    for config in _rounds(M,N,sensors,rounds,seed,pool,deadline) :
+        if config is not None :
+            stale = 0
+            yield config
+        else :
+            stale += 1
+            if maxStale is not None and stale >= maxStale :
+                return
+
+def _rounds(M,N,sensors,rounds,seed,pool,deadline = None) -> Iterator[Optional[List]]:
+    """Un élément par round : la nouvelle configuration trouvée, ou None si elle était déjà connue."""
+    native = isinstance(sensors, Instance)
+    instance = instanceOf(M,sensors)
+    if pool is None :
+        pool = ConfigPool(N)
+    rng = random.Random(seed) if seed is not None else random
+
+    i = 0
+    while rounds is None or i < rounds :
+        if deadline is not None and time.monotonic() >= deadline :
+            return
+        i += 1
+
+        ids = generateElementaryIds(instance,rng)
+
+        if pool.addMask(ConfigPool.idsToMask(ids)):
+            yield ids if native else Instance.toSensorIds(ids)
+        else :
+            yield None
+
+def generateElementary(M,N,sensors,rng = random):
     """génère une config aléatoire élémentaire."""
-    chosen : Set = set()
+    return Instance.toSensorIds(generateElementaryIds(instanceOf(M,sensors),rng))
+
+def generateElementaryIds(instance,rng = random) -> array:
+    """génère une config aléatoire élémentaire, en indices de capteurs."""
+    masks = instance.masks
+    full = instance.full
+    N = instance.N
+    chosen : List[int] = []
+    seen = set()
+    covered = 0
 
-    while not (coversAll(M,N,sensors,chosen)):
+    while covered != full:
 
-        randomSensorIndex = random.randint(1,N)
+        randomSensorIndex = rng.randint(1,N) - 1
 
-        chosen.add(f"s{randomSensorIndex}")
+        if randomSensorIndex not in seen:
+            seen.add(randomSensorIndex)
+            chosen.append(randomSensorIndex)
+            covered |= masks[randomSensorIndex]
 
-    while not isElementary(M,N,sensors,chosen):
+    while not instance.isElementary(chosen):
         copy = [s for s in chosen]
 
-        randomSensorIndex = random.randint(0,len(copy)-1)
+        randomSensorIndex = rng.randint(0,len(copy)-1)
 
         copy.pop(randomSensorIndex)
 
-        if coversAll(M,N,sensors,copy):
+        if instance.coversAll(copy):
             chosen = copy
 
-    return chosen
\ No newline at end of file
+    return array('i', chosen)
+
+def _generateParallel(M,N,sensors,rounds,workers,seed) -> Iterator[List[str]]:
+    """
+    Répartit les rounds sur workers processus et produit leurs configurations
+    distinctes, worker par worker, dès que chaque shard est terminé. Fermer
+    le générateur annule les shards qui n'ont pas commencé.
+    """
+    master = random.Random(seed)
+    seeds = [master.getrandbits(64) for _ in range(workers)]
+    shards = [rounds // workers + (1 if w < rounds % workers else 0) for w in range(workers)]
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try :
+        futures = [executor.submit(_generateShard,M,N,sensors,shards[w],seeds[w]) for w in range(workers)]
+
+        seen = set()
+        for future in futures :
+            for config in future.result() :
+                if config not in seen:
+                    seen.add(config)
+                    yield [f"s{i}" for i in config]
+    finally :
+        executor.shutdown(cancel_futures=True)
+
+def _generateShard(M,N,sensors,rounds,seed) -> List[Tuple[int, ...]]:
+    """Worker : génère rounds configurations, renvoyées comme tuples triés d'indices."""
+    rng = random.Random(seed)
+    configs = []
+    seen = set()
+
+    for i in range(rounds):
+        config = tuple(sorted(i + 1 for i in generateElementaryIds(instanceOf(M,sensors),rng)))
+        if config not in seen:
+            seen.add(config)
+            configs.append(config)
+
+    return configs
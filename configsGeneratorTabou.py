@@ -1,46 +1,390 @@
+import heapq
+import multiprocessing
 import random
-from typing import Set, List
-from util import coversAll, isElementary
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from configPool import ConfigPool
+from instance import Instance
+from util import coverageIndex
 
-def generateConfigsTabou(M, N, sensors, rounds=100, tabu_size=10):
-    configs = []
-    tabu_sensors = set()
+# Consecutive moves without a new config after which the lazy search gives up
+MAX_STALE = 1000
 
-    # Initial config
-    current_config = generateElementaryAvoidingTabu(M, N, sensors, tabu_sensors)
-    configs.append(current_config)
+def generateConfigsTabou(M, N, sensors, rounds=100, tabu_size=10, pool=None, patience=20, seed=None,
+                         progress=None, stop=None, verbose=False, workers=1, exchange_every=20, elite_size=10):
+    """
+    Tabu search over elementary configs. Every distinct elementary config
+    visited is kept. When a ConfigPool is given, configs already in it are
+    treated as duplicates and new ones are added to it.
+
+    Each move inserts a sensor into the current config and drops the sensors
+    it makes redundant, lowest lifetime first, so the config stays
+    elementary. Moves are scored from the zones covered exactly once by the
+    current config: a sensor can only be dropped once the inserted sensor
+    covers all of its uniquely covered zones. The best move leads first to an
+    unseen config, then to the highest minimum lifetime, then to the fewest
+    sensors.
+
+    Dropped sensors are tabu for tabu_size moves (FIFO). A tabu move is still
+    allowed when it yields a config better than the best one found
+    (aspiration). After patience moves without a new config, the search
+    restarts from a random elementary config.
+
+    progress, when given, is called after each move with the number of
+    configs found so far. stop, when given, is called after each move with
+    the list of configs found so far; the search ends as soon as it returns
+    True. verbose prints every config found with its checks.
 
-    for _ in range(rounds):
-        # Add some used sensors to tabu list
-        used_sensors = random.sample(current_config, min(len(current_config), 2))
-        tabu_sensors.update(used_sensors)
+    With workers > 1, the rounds are split over independent trajectories in
+    worker processes (see _generateMultiStart); progress and stop are then
+    called every exchange_every moves.
 
-        # Cap tabu list size
-        if len(tabu_sensors) > tabu_size:
-            tabu_sensors = set(list(tabu_sensors)[-tabu_size:])
+    sensors may also be an Instance: the search then runs on its
+    sensors() view and the configs are returned as array('i') of sensor
+    indices, like the random generator does.
+    """
+    if isinstance(sensors, Instance):
+        converted = []
 
-        # Try to generate new config avoiding tabu sensors
-        new_config = generateElementaryAvoidingTabu(M, N, sensors, tabu_sensors)
+        def native_stop(found):
+            # Only the configs found since the last call are converted
+            converted.extend(Instance.fromSensorIds(c) for c in found[len(converted):])
+            return stop(converted)
+
+        configs = generateConfigsTabou(M, N, sensors.sensors(), rounds, tabu_size, pool, patience, seed, progress,
+                                       native_stop if stop is not None else None, verbose, workers,
+                                       exchange_every, elite_size)
+        return [Instance.fromSensorIds(c) for c in configs]
+
+    if workers > 1:
+        configs = _generateMultiStart(M, N, sensors, rounds, tabu_size, pool, patience, seed, progress, stop,
+                                      workers, exchange_every, elite_size)
+        if verbose:
+            _printConfigs(M, sensors, configs)
+        return configs
+
+    configs = []
+    moves = _moves(M, N, sensors, rounds, tabu_size, pool, patience, seed)
 
-        # If no new valid config, break
-        if not new_config or sorted(new_config) in [sorted(c) for c in configs]:
+    # The first item is the initial config, the others one per move
+    initial = next(moves)
+    if initial is not None:
+        configs.append(initial)
+
+    for config in moves:
+        if config is not None:
+            configs.append(config)
+
+        if progress is not None:
+            progress(len(configs))
+
+        if stop is not None and stop(configs):
             break
 
-        configs.append(new_config)
-        current_config = new_config
+    if verbose:
+        _printConfigs(M, sensors, configs)
+
+    return configs
+
 
-    # Display results
+def _printConfigs(M, sensors, configs: List[List[str]]) -> None:
+    index = coverageIndex(M, sensors)
     for config in configs:
         print("---------------------------------------------------")
         print(config)
-        print("covers all ? :", coversAll(M, N, sensors, config))
-        print("elementary ? :", isElementary(M, N, sensors, config))
+        print("covers all ? :", index.coversAll(config))
+        print("elementary ? :", index.isElementary(config))
         print("total life :", sum(sensors[s]['life'] for s in config))
         print("---------------------------------------------------")
 
+
+def iterConfigsTabou(M, N, sensors, rounds=None, tabu_size=10, pool=None, patience=20, seed=None,
+                     deadline=None, max_stale=MAX_STALE) -> Iterator[List[str]]:
+    """
+    Lazy version of generateConfigsTabou: yields each new config as soon as
+    it is found. The search ends after rounds moves (never when None), once
+    time.monotonic() reaches deadline, or after max_stale moves in a row
+    without a new config, when the instance is likely exhausted (never when
+    None). With an Instance, configs are yielded as array('i') of sensor
+    indices.
+    """
+    native = isinstance(sensors, Instance)
+    if native:
+        sensors = sensors.sensors()
+    stale = 0
+    for config in _moves(M, N, sensors, rounds, tabu_size, pool, patience, seed, deadline):
+        if config is not None:
+            stale = 0
+            yield Instance.fromSensorIds(config) if native else config
+        else:
+            stale += 1
+            if max_stale is not None and stale >= max_stale:
+                return
+
+
+def _generateMultiStart(M, N, sensors, rounds, tabu_size, pool, patience, seed, progress, stop,
+                        workers, exchange_every, elite_size) -> List[List[str]]:
+    """
+    Multi-start tabu search: one trajectory per worker process, each with
+    its own seed derived from seed. The first trajectory starts from the
+    usual highest-lifetime config, the others from random elementary configs.
+
+    The rounds are split over the trajectories and run in epochs of
+    exchange_every moves. After each epoch, the configs of all trajectories
+    are merged in worker order and sent back to every worker, so that a
+    trajectory treats the configs found by the others as already seen. The
+    elite_size best ones by lifetime efficiency (see _score) are the elite
+    pool: a trajectory that stagnates restarts from an elite config half of
+    the time instead of a random one. For a given
+    seed and number of workers, the configs returned are identical.
+    """
+    if pool is None:
+        pool = ConfigPool(N)
+    master = random.Random(seed)
+    seeds = [master.getrandbits(64) for _ in range(workers)]
+    remaining = [rounds // workers + (1 if w < rounds % workers else 0) for w in range(workers)]
+    life = {s: sensors[s]['life'] for s in sensors}
+
+    connections = []
+    processes = []
+    for w in range(workers):
+        parent_end, child_end = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_trajectory, daemon=True,
+                                          args=(child_end, M, N, sensors, tabu_size, patience, seeds[w], w > 0))
+        process.start()
+        child_end.close()
+        connections.append(parent_end)
+        processes.append(process)
+
+    configs = []
+    elite: List[List[str]] = []
+    found: List[List[str]] = []
+    try:
+        while any(remaining):
+            active = [w for w in range(workers) if remaining[w]]
+            for w in active:
+                moves = min(exchange_every, remaining[w])
+                remaining[w] -= moves
+                connections[w].send((moves, elite, found))
+
+            found = []
+            for w in active:
+                for config in connections[w].recv():
+                    if pool.add(config):
+                        found.append(config)
+            configs.extend(found)
+            elite = heapq.nlargest(elite_size, elite + found, key=lambda c: _score(c, life))
+
+            if progress is not None:
+                progress(len(configs))
+            if stop is not None and stop(configs):
+                break
+    finally:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in processes:
+            process.join()
+
     return configs
 
 
+def _trajectory(connection, M, N, sensors, tabu_size, patience, seed, diversify) -> None:
+    """
+    Worker of _generateMultiStart: receives (moves, elite, configs found by
+    all trajectories in the last epoch) for each epoch and sends back the new
+    configs found in those moves; None ends it.
+    """
+    index = coverageIndex(M, sensors)
+    pool = ConfigPool(N)
+    elite: List[List[str]] = []
+
+    def restart(rng) -> List[str]:
+        if elite and rng.random() < 0.5:
+            return rng.choice(elite)
+        return _randomElementary(index, rng)
+
+    moves = _moves(M, N, sensors, None, tabu_size, pool, patience, seed, diversify=diversify, restart=restart)
+    initial = next(moves)
+    found = [initial] if initial is not None else []
+
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        count, elite[:], others = task
+        pool.update(others)
+        for _ in range(count):
+            config = next(moves)
+            if config is not None:
+                found.append(config)
+        connection.send(found)
+        found = []
+    connection.close()
+
+
+def _moves(M, N, sensors, rounds, tabu_size, pool, patience, seed, deadline=None, diversify=False,
+           restart=None) -> Iterator[Optional[List[str]]]:
+    """
+    The search itself: yields the initial config, then one item per move,
+    each being the config reached when it is new and None otherwise.
+
+    diversify starts from a random elementary config instead of the
+    highest-lifetime one, and scores moves with lifetimes scaled by a random
+    factor between 0.5 and 1.5 per sensor, so that trajectories with
+    different seeds head for different configs. restart(rng), when given,
+    returns the config to restart from when the search stagnates.
+    """
+    index = coverageIndex(M, sensors)
+    rng = random.Random(seed) if seed is not None else random
+    if pool is None:
+        pool = ConfigPool(N)
+    life = {s: sensors[s]['life'] for s in index.masks}
+    if diversify:
+        life = {s: l * rng.uniform(0.5, 1.5) for s, l in life.items()}
+    tabu = _TabuList(tabu_size)
+
+    if restart is None:
+        restart = lambda rng: _randomElementary(index, rng)
+
+    # Initial config
+    if diversify:
+        current_config = sorted(_randomElementary(index, rng))
+    else:
+        current_config = sorted(generateElementaryAvoidingTabu(M, N, sensors, set()))
+    yield current_config if pool.add(current_config) else None
+    best_score = _score(current_config, life)
+    stagnation = 0
+
+    move_count = 0
+    while rounds is None or move_count < rounds:
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+        move_count += 1
+
+        move = bestMove(index, life, current_config, tabu, pool, best_score)
+
+        if move is None or stagnation >= patience:
+            # Diversification: restart from a random elementary config (or from restart)
+            current_config = sorted(restart(rng))
+            tabu.clear()
+            stagnation = 0
+        else:
+            added, dropped, current_config = move
+            for s in dropped:
+                tabu.push(s)
+
+        best_score = max(best_score, _score(current_config, life))
+
+        if pool.add(current_config):
+            stagnation = 0
+            yield current_config
+        else:
+            stagnation += 1
+            yield None
+
+
+def bestMove(index, life: Dict[str, float], current: List[str], tabu: "_TabuList",
+             pool: ConfigPool, best_score: Tuple[float, int]) -> Optional[Tuple[str, List[str], List[str]]]:
+    """
+    Returns the best admissible (added sensor, dropped sensors, new config)
+    move from current, or None when no sensor can be inserted.
+    """
+    masks = index.masks
+    unique = index.uniqueZones(current)
+    # Zones that each sensor of the config is the only one to cover
+    unique_of = [(s, masks[s] & unique) for s in sorted(current, key=life.get)]
+    in_current = set(current)
+
+    best = None
+    best_key = None
+    for s, mask in masks.items():
+        if s in in_current:
+            continue
+        # Quick filter: the insertion must make at least one sensor redundant
+        if not any(u & ~mask == 0 for _, u in unique_of):
+            continue
+
+        dropped, new_config = _insert(index, current, unique_of, s)
+        if not dropped:
+            continue
+        score = _score(new_config, life)
+        if s in tabu and score <= best_score:
+            continue  # tabu, and no aspiration
+
+        key = (new_config not in pool, score)
+        if best_key is None or key > best_key:
+            best, best_key = (s, dropped, new_config), key
+
+    return best
+
+
+def _insert(index, current: List[str], unique_of: List[Tuple[str, int]], added: str) -> Tuple[List[str], List[str]]:
+    """Inserts added and drops the sensors it makes redundant, lowest lifetime first."""
+    masks = index.masks
+    kept = list(current)
+    kept.append(added)
+    dropped = []
+    for s, u in unique_of:
+        if u & ~masks[added]:
+            continue  # still the only one to cover some zone
+        candidate = [r for r in kept if r != s]
+        if not masks[s] & index.uniqueZones(kept):
+            kept = candidate
+            dropped.append(s)
+    return dropped, sorted(kept)
+
+
+def _score(config: List[str], life: Dict[str, float]) -> Tuple[float, int]:
+    """Lifetime efficiency of a config: its weakest sensor first, then its size."""
+    return (min(life[s] for s in config), -len(config))
+
+
+def _randomElementary(index, rng) -> List[str]:
+    sensors_ids = list(index.masks)
+    rng.shuffle(sensors_ids)
+    chosen = []
+    covered = 0
+    for s in sensors_ids:
+        if index.masks[s] & ~covered:
+            chosen.append(s)
+            covered |= index.masks[s]
+            if covered == index.full:
+                break
+    return index.makeElementary(chosen)
+
+
+class _TabuList:
+    """FIFO tabu memory with O(1) membership; a sensor stays tabu for size pushes."""
+
+    def __init__(self, size: int):
+        self.queue = deque()
+        self.size = size
+        self.counts: Dict[str, int] = {}
+
+    def push(self, sensor: str) -> None:
+        if self.size <= 0:
+            return
+        self.queue.append(sensor)
+        self.counts[sensor] = self.counts.get(sensor, 0) + 1
+        if len(self.queue) > self.size:
+            old = self.queue.popleft()
+            self.counts[old] -= 1
+            if not self.counts[old]:
+                del self.counts[old]
+
+    def clear(self) -> None:
+        self.queue.clear()
+        self.counts.clear()
+
+    def __contains__(self, sensor: str) -> bool:
+        return sensor in self.counts
+
+
 def generateElementaryAvoidingTabu(M, N, sensors, tabu_sensors: Set[str]):
     """Generates an elementary config while avoiding sensors in the tabu list."""
 
@@ -52,19 +396,22 @@ def generateElementaryAvoidingTabu(M, N, sensors, tabu_sensors: Set[str]):
     if not available:
         return set()
 
+    index = coverageIndex(M, sensors)
     chosen: Set[str] = set()
+    covered = 0
     for sensor in available:
         chosen.add(sensor)
-        if coversAll(M, N, sensors, chosen):
+        covered |= index.masks[sensor]
+        if covered == index.full:
             break
 
     # Try to reduce the config to make it elementary
-    while not isElementary(M, N, sensors, chosen):
+    while not index.isElementary(chosen):
         removable = sorted(chosen, key=lambda s: sensors[s]['life'])  # Prefer removing low-life
         for s in removable:
             temp = set(chosen)
             temp.remove(s)
-            if coversAll(M, N, sensors, temp):
+            if index.coversAll(temp):
                 chosen = temp
                 break
         else:
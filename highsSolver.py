@@ -0,0 +1,96 @@
+import time
+from typing import Dict, List, TypedDict, Union
+
+import profiling
+from configPool import ConfigPool
+from instance import Instance
+from util import instanceOf
+
+class SolutionResult(TypedDict):
+    max_time: float
+    config_activation_times: List[Dict[str, float]]
+
+def preload() -> None:
+    """
+    Imports numpy and scipy ahead of solve, e.g. before forking processes
+    that will call it (see portfolioSolver).
+    """
+    import numpy
+    import scipy.optimize
+    import scipy.sparse
+
+def solve(
+    M: int,
+    N: int,
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: List[List[str]]
+) -> SolutionResult:
+    """
+    Solves the sensor scheduling problem in-process with HiGHS (through
+    scipy.optimize.linprog). The sensor x configuration matrix is handed to
+    the solver as a sparse matrix built from ConfigPool.csr(), so no file or
+    subprocess is involved. Duplicate configurations share one column, whose
+    time is reported on the first of them.
+
+    Args:
+        M: Number of zones (unused but kept for interface)
+        N: Number of sensors (unused but kept for interface)
+        sensors: Dictionary mapping sensor IDs to their properties (must include 'life'),
+            or an Instance, in which case each configuration is a sequence of sensor indices
+        configurations: List of valid configurations (each configuration is a list of sensor IDs)
+
+    Returns:
+        The same SolutionResult as pulpSolver.solve
+    """
+    # scipy is only needed by this backend
+    import numpy as np
+    from scipy.optimize import linprog
+    from scipy.sparse import csc_array
+
+    # One pool column per distinct configuration; duplicates share it
+    native = isinstance(sensors, Instance)
+    instance = instanceOf(M, sensors)
+    pool = ConfigPool(instance.N)
+    columns = []
+    for config in configurations:
+        mask = ConfigPool.idsToMask(config) if native else ConfigPool.toMask(config)
+        pool.addMask(mask)
+        columns.append(pool.positions[mask])
+    indptr, indices = pool.csr()
+
+    # Maximize the total time: linprog minimizes, hence the negated objective
+    c = np.full(len(pool), -1.0)
+    # The configuration x sensor CSR of the pool is the sensor x configuration
+    # constraint matrix in CSC form; sensors in no configuration give empty rows
+    A_ub = csc_array(
+        (np.ones(len(indices)), np.asarray(indices), np.asarray(indptr)),
+        shape=(instance.N, len(pool))
+    )
+    lives = np.asarray(instance.life, dtype=float)
+
+    start = time.perf_counter()
+    result = linprog(c, A_ub=A_ub, b_ub=lives, bounds=(0, None), method='highs')
+    seconds = time.perf_counter() - start
+
+    if result.status != 0:
+        raise RuntimeError(f"Optimization failed with status: {result.message}")
+
+    profiling.record_solver('highs', int(result.nit), seconds)
+
+    # Prepare the detailed results
+    activation_times = []
+    reported = set()
+    for config, column in zip(configurations, columns):
+        activation = result.x[column]
+        # Only include configurations with non-negligible activation
+        if activation > 1e-6 and column not in reported:
+            reported.add(column)
+            activation_times.append({
+                'config': config,
+                'time': float(activation)
+            })
+
+    return {
+        'max_time': float(-result.fun),
+        'config_activation_times': activation_times
+    }
@@ -0,0 +1,135 @@
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+
+class Instance:
+    """
+    Instance à identifiants entiers, sur tableaux compacts.
+
+    Le capteur i (0 <= i < N) est le capteur s{i+1} des fichiers, la zone j
+    (0 <= j < M) la zone z{j+1} :
+    - life[i] : durée de vie du capteur i (array 'd' ou memoryview)
+    - zones[indptr[i]:indptr[i+1]] : zones couvertes par le capteur i (CSR)
+    - masks[i] : les mêmes zones en masque de bits (bit j pour la zone j),
+      calculés au premier accès
+
+    Une configuration est une séquence d'indices de capteurs (array('i')
+    pour celles que produit cette classe). Les identifiants "s{i}" / "z{j}"
+    ne sont fabriqués que pour l'affichage (toSensorIds) ou pour les
+    fonctions qui attendent encore le dictionnaire sensors (sensors()).
+    """
+
+    __slots__ = ("N", "M", "life", "indptr", "zones", "_masks", "_buffer")
+
+    def __init__(self, N: int, M: int, life, indptr, zones, buffer=None):
+        self.N = N
+        self.M = M
+        self.life = life
+        self.indptr = indptr
+        self.zones = zones
+        self._masks: Optional[List[int]] = None
+        self._buffer = buffer
+
+    def __reduce__(self):
+        # Une instance lue depuis le cache référence le mmap : copie en array pour l'envoyer à un autre processus
+        return (Instance, (self.N, self.M, _toArray('d', self.life), _toArray('q', self.indptr),
+                           _toArray('i', self.zones)))
+
+    @classmethod
+    def fromSensors(cls, M: int, N: int, sensors: Dict[str, Dict[str, object]]) -> "Instance":
+        """Construit l'instance depuis le dictionnaire {s{i}: {coverage, life}}."""
+        life = array('d', [0.0] * N)
+        indptr = array('q', [0])
+        zones = array('i')
+        for i in range(N):
+            data = sensors[f"s{i + 1}"]
+            life[i] = float(data["life"])
+            zones.extend(int(z[1:]) - 1 for z in data["coverage"] if 0 < int(z[1:]) <= M)
+            indptr.append(len(zones))
+        return cls(N, M, life, indptr, zones)
+
+    def coverage(self, i: int):
+        """Zones couvertes par le capteur i."""
+        return self.zones[self.indptr[i]:self.indptr[i + 1]]
+
+    @property
+    def masks(self) -> List[int]:
+        if self._masks is None:
+            masks = []
+            full = self.full
+            zones = self.zones
+            indptr = self.indptr
+            for i in range(self.N):
+                mask = 0
+                for j in zones[indptr[i]:indptr[i + 1]]:
+                    mask |= 1 << j
+                masks.append(mask & full)
+            self._masks = masks
+        return self._masks
+
+    @property
+    def full(self) -> int:
+        return (1 << self.M) - 1
+
+    def union(self, config: Iterable[int]) -> int:
+        masks = self.masks
+        covered = 0
+        for i in config:
+            covered |= masks[i]
+        return covered
+
+    def coversAll(self, config: Iterable[int]) -> bool:
+        return self.union(config) == self.full
+
+    def uniqueZones(self, config: Iterable[int]) -> int:
+        """Masque des zones couvertes par exactement un capteur de config."""
+        masks = self.masks
+        once = 0
+        twice = 0
+        for i in config:
+            mask = masks[i]
+            twice |= once & mask
+            once |= mask
+        return once & ~twice
+
+    def isElementary(self, config: Iterable[int]) -> bool:
+        config = list(config)
+        if not self.coversAll(config):
+            return False
+        unique = self.uniqueZones(config)
+        masks = self.masks
+        return all(masks[i] & unique for i in config)
+
+    def makeElementary(self, config: Iterable[int]) -> array:
+        """Retire les capteurs redondants de config, dans l'ordre de config."""
+        kept = list(config)
+        masks = self.masks
+        for i in list(kept):
+            if not masks[i] & self.uniqueZones(kept):
+                kept.remove(i)
+        return array('i', kept)
+
+    @staticmethod
+    def sensorId(i: int) -> str:
+        return f"s{i + 1}"
+
+    @staticmethod
+    def toSensorIds(config: Iterable[int]) -> List[str]:
+        return [f"s{i + 1}" for i in config]
+
+    @staticmethod
+    def fromSensorIds(config: Iterable[str]) -> array:
+        return array('i', [int(s[1:]) - 1 for s in config])
+
+    def sensors(self):
+        """Vue {s{i}: {coverage, life}} pour les fonctions qui attendent le dictionnaire sensors."""
+        from reader import SensorsView
+        return SensorsView(self)
+
+
+def _toArray(typecode: str, data) -> array:
+    if isinstance(data, array):
+        return data
+    copy = array(typecode)
+    copy.frombytes(memoryview(data).cast('B'))
+    return copy
@@ -0,0 +1,122 @@
+import argparse
+import math
+import random
+from array import array
+from typing import List, Optional, Tuple
+
+from instance import Instance
+
+LIFETIMES = ["uniform", "normal", "exponential"]
+OVERLAPS = ["random", "line", "grid", "clusters"]
+
+
+def generateInstance(N: int, M: int, density: float = 0.5, lifetimes: str = "uniform",
+                     lifeRange: Tuple[int, int] = (1, 200), overlap: str = "random", clusters: Optional[int] = None,
+                     crossover: float = 0.1, seed: Optional[int] = None) -> Instance:
+    """
+    Instance synthétique de N capteurs et M zones, reproductible pour un même seed.
+
+    Chaque capteur couvre en moyenne density * M zones (au moins une, comme
+    l'exige le format de fichier). Leur disposition dépend de overlap :
+    - "random" : zones tirées uniformément ;
+    - "line" : zones consécutives sur un anneau ;
+    - "grid" : carré de zones d'une grille torique, à partir d'une zone au hasard ;
+    - "clusters" : zones d'un groupe (clusters groupes, sqrt(M) par défaut),
+      chacune tirée hors du groupe avec la probabilité crossover.
+    Les zones que ce tirage ne couvre pas sont ajoutées à un capteur au hasard :
+    l'instance admet toujours une configuration.
+
+    Les durées de vie sont entières, dans lifeRange, tirées selon lifetimes :
+    "uniform", "normal" (centrée, écart-type d'un sixième de l'intervalle) ou
+    "exponential" (moyenne au quart de l'intervalle).
+    """
+    if overlap not in OVERLAPS:
+        raise ValueError(f"unknown overlap pattern : {overlap}")
+    if lifetimes not in LIFETIMES:
+        raise ValueError(f"unknown lifetime distribution : {lifetimes}")
+
+    rng = random.Random(seed)
+    cols = math.isqrt(M - 1) + 1
+    rows = (M + cols - 1) // cols
+    if clusters is None:
+        clusters = max(1, math.isqrt(M))
+    bounds = [M * c // clusters for c in range(clusters + 1)]
+
+    mean = density * M
+    spread = math.sqrt(mean * max(0.0, 1 - density))
+    coverages: List[List[int]] = []
+    covered = bytearray(M)
+    for _ in range(N):
+        k = min(M, max(1, round(rng.gauss(mean, spread))))
+        if overlap == "random":
+            zones = rng.sample(range(M), k)
+        elif overlap == "line":
+            start = rng.randrange(M)
+            zones = [(start + d) % M for d in range(k)]
+        elif overlap == "grid":
+            side = math.isqrt(k - 1) + 1
+            y, x = divmod(rng.randrange(M), cols)
+            cells = ((y + dy) % rows * cols + (x + dx) % cols for dy in range(side) for dx in range(side))
+            zones = sorted({z for z in cells if z < M})[:k]
+        else:
+            c = rng.randrange(clusters)
+            low, high = bounds[c], bounds[c + 1]
+            inside = min(high - low, sum(1 for _ in range(k) if rng.random() >= crossover))
+            zones = set(rng.sample(range(low, high), inside))
+            while len(zones) < k:
+                zones.add(rng.randrange(M))
+            zones = list(zones)
+        for z in zones:
+            covered[z] = 1
+        coverages.append(zones)
+
+    for z in range(M):
+        if not covered[z]:
+            coverages[rng.randrange(N)].append(z)
+
+    low, high = lifeRange
+    life = array('d', [_lifetime(rng, lifetimes, low, high) for _ in range(N)])
+    indptr = array('q', [0])
+    zones = array('i')
+    for coverage in coverages:
+        zones.extend(sorted(coverage))
+        indptr.append(len(zones))
+    return Instance(N, M, life, indptr, zones)
+
+
+def _lifetime(rng: random.Random, distribution: str, low: int, high: int) -> float:
+    if distribution == "uniform":
+        value = rng.uniform(low, high)
+    elif distribution == "normal":
+        value = rng.gauss((low + high) / 2, (high - low) / 6)
+    else:
+        value = low + rng.expovariate(4 / max(high - low, 1))
+    return float(min(high, max(low, round(value))))
+
+
+def writeInstance(instance: Instance, filepath: str) -> None:
+    """Écrit l'instance au format de reader.read_data_file (durées entières, zones à partir de 1)."""
+    lines = [str(instance.N), str(instance.M), " ".join(str(int(l)) for l in instance.life)]
+    for i in range(instance.N):
+        lines.append(" ".join(str(z + 1) for z in instance.coverage(i)))
+    with open(filepath, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Écrit une instance synthétique au format des fichiers d'examples/")
+    parser.add_argument("output")
+    parser.add_argument("N", type=int, help="nombre de capteurs")
+    parser.add_argument("M", type=int, help="nombre de zones")
+    parser.add_argument("--density", type=float, default=0.5, help="fraction moyenne des zones couvertes par capteur")
+    parser.add_argument("--lifetimes", choices=LIFETIMES, default="uniform")
+    parser.add_argument("--life-range", type=int, nargs=2, default=[1, 200], metavar=("MIN", "MAX"))
+    parser.add_argument("--overlap", choices=OVERLAPS, default="random")
+    parser.add_argument("--clusters", type=int, default=None, help="nombre de groupes avec --overlap clusters")
+    parser.add_argument("--crossover", type=float, default=0.1,
+                        help="probabilité qu'une zone soit tirée hors du groupe avec --overlap clusters")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    writeInstance(generateInstance(args.N, args.M, args.density, args.lifetimes, tuple(args.life_range),
+                                   args.overlap, args.clusters, args.crossover, args.seed), args.output)
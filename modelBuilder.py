@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List, Tuple, Union
+
+from instance import Instance
+
+
+def build_sensor_rows(
+    sensors: Dict[str, Dict[str, object]],
+    configurations: Iterable[Iterable[str]]
+) -> List[Tuple[str, List[int]]]:
+    """
+    Builds the sparse sensor x configuration incidence of the scheduling LP
+    in a single pass over the configurations.
+
+    Args:
+        sensors: Dictionary mapping sensor IDs to their properties
+        configurations: Configurations, each one an iterable of sensor IDs
+
+    Returns:
+        One (sensor_id, column indices) row per sensor that appears in at
+        least one configuration, in the iteration order of sensors. Column
+        indices are increasing, so each row is the sensor's lifetime
+        constraint of the LP.
+    """
+    columns: Dict[str, List[int]] = {sensor_id: [] for sensor_id in sensors}
+
+    for i, config in enumerate(configurations):
+        for sensor_id in config:
+            row = columns.get(sensor_id)
+            if row is not None and (not row or row[-1] != i):
+                row.append(i)
+
+    return [(sensor_id, row) for sensor_id, row in columns.items() if row]
+
+
+def build_lifetime_rows(
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: Iterable[Iterable]
+) -> List[Tuple[str, List[int], float]]:
+    """
+    Same rows as build_sensor_rows, with each sensor's lifetime appended:
+    (sensor_id, column indices, life).
+
+    sensors may also be an Instance, with configurations given as sequences
+    of sensor indices; the rows are then built on the integer indices and
+    only the N row names are formatted.
+    """
+    if not isinstance(sensors, Instance):
+        return [(sensor_id, columns, sensors[sensor_id]['life'])
+                for sensor_id, columns in build_sensor_rows(sensors, configurations)]
+
+    columns: List[List[int]] = [[] for _ in range(sensors.N)]
+    for i, config in enumerate(configurations):
+        for s in config:
+            row = columns[s]
+            if not row or row[-1] != i:
+                row.append(i)
+
+    return [(f"s{s + 1}", row, sensors.life[s]) for s, row in enumerate(columns) if row]
@@ -0,0 +1,237 @@
+import importlib
+import itertools
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from presolve import PresolvedInstance
+from util import upperBound
+
+GENERATORS = ["random", "tabou", "greedy", "exact"]
+
+# Solver backends by name : each module exposes solve(M, N, sensors, configurations) -> SolutionResult
+SOLVER_MODULES = {
+    "pulp": "pulpSolver",
+    "GLPK": "GLPKSolver",
+    "highs": "highsSolver",
+    "portfolio": "portfolioSolver",
+    # Column generation from the given configs, within columnGeneration.TIME_LIMIT seconds
+    "colgen": "columnGeneration",
+}
+SOLVERS = list(SOLVER_MODULES)
+
+
+def generate(name: str, M: int, N: int, sensors: Dict[str, Dict[str, object]],
+             rounds: int = 100, tabu_size: int = 10, seed: Optional[int] = None,
+             stop: Optional[Callable[[List[List[str]]], bool]] = None,
+             presolved: Optional[PresolvedInstance] = None, verbose: bool = False,
+             workers: int = 1) -> List[List[str]]:
+    """
+    Runs the named configuration generator; seed makes the run reproducible.
+    stop is handed to the generator, which ends early once it returns True
+    (see GapTracker).
+
+    With presolved (see presolve.presolve), the generator runs on the reduced
+    instance instead of M, N, sensors and the configs are returned in the
+    original sensor IDs. stop then sees the configs of the reduced instance.
+
+    verbose makes the random and tabu generators print every config found.
+    workers > 1 spreads the random rounds, or multi-start tabu trajectories,
+    over that many processes.
+
+    "exact" enumerates every elementary config, so the LP on them is optimal;
+    past its size or time cap it falls back to rounds random rounds.
+    """
+    if presolved is not None:
+        if presolved.M == 0:
+            # The mandatory sensors already cover every zone
+            return [list(presolved.mandatory)]
+        configs = generate(name, presolved.M, presolved.N, presolved.sensors, rounds, tabu_size, seed, stop,
+                           verbose=verbose, workers=workers)
+        return presolved.restoreAll(configs)
+
+    if seed is not None:
+        random.seed(seed)
+
+    if name == "random":
+        from configsGeneratorRandom import generateConfigsRandom
+        return generateConfigsRandom(M, N, sensors, rounds, workers=workers, seed=seed, stop=stop, verbose=verbose)
+    if name == "tabou":
+        from configsGeneratorTabou import generateConfigsTabou
+        return generateConfigsTabou(M, N, sensors, rounds, tabu_size, seed=seed, stop=stop, verbose=verbose,
+                                    workers=workers)
+    if name == "greedy":
+        from configsGeneratorGreedy import generer_configurations_elementaires
+        return generer_configurations_elementaires(M, N, sensors, k=3, stop=stop)
+    if name == "exact":
+        from configsGeneratorExact import generateConfigsExact
+        return generateConfigsExact(M, N, sensors, fallbackRounds=rounds, seed=seed, stop=stop, verbose=verbose)
+    raise ValueError(f"unknown generator : {name}")
+
+
+def iter_configs(name: str, M: int, N: int, sensors: Dict[str, Dict[str, object]],
+                 rounds: Optional[int] = None, tabu_size: int = 10, seed: Optional[int] = None,
+                 deadline: Optional[float] = None) -> Iterator[List[str]]:
+    """
+    Lazy counterpart of generate: yields each new config as soon as the named
+    generator finds it. The generator stops after rounds rounds (greedy: after
+    rounds configs; exact: when the enumeration is done, or after rounds
+    random rounds past its size cap), or once time.monotonic() reaches
+    deadline. The random, tabu and greedy generators also stop after a long
+    run of rounds without a new config (see their MAX_STALE / MAX_ECHECS),
+    so a small instance ends the stream once it is exhausted.
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    if name == "random":
+        from configsGeneratorRandom import iterConfigsRandom
+        return iterConfigsRandom(M, N, sensors, rounds, seed=seed, deadline=deadline)
+    if name == "tabou":
+        from configsGeneratorTabou import iterConfigsTabou
+        return iterConfigsTabou(M, N, sensors, rounds, tabu_size, seed=seed, deadline=deadline)
+    if name == "greedy":
+        from configsGeneratorGreedy import iterer_configurations_elementaires
+        configs = iterer_configurations_elementaires(M, N, sensors, k=3, echeance=deadline)
+        return itertools.islice(configs, rounds) if rounds is not None else configs
+    if name == "exact":
+        from configsGeneratorExact import iterConfigsExact
+        return iterConfigsExact(M, N, sensors, rounds=rounds, seed=seed, deadline=deadline)
+    raise ValueError(f"unknown generator : {name}")
+
+
+def solve_streaming(name: str, M: int, N: int, sensors: Dict[str, Dict[str, object]], solver: str = "pulp",
+                    time_budget: Optional[float] = None, batch_size: int = 50, max_batches: Optional[int] = None,
+                    rounds: Optional[int] = None, tabu_size: int = 10, seed: Optional[int] = None,
+                    on_batch: Optional[Callable[[Dict[str, object], int, float], None]] = None
+                    ) -> Tuple[Optional[Dict[str, object]], List[List[str]]]:
+    """
+    Generates and solves at the same time. Configs from iter_configs are
+    consumed in batches of batch_size, and the LP is re-solved on all configs
+    so far after each batch (pulp keeps one SolverSession, so each re-solve
+    only adds columns and warm-starts from the previous basis).
+
+    Stops when time_budget seconds have elapsed, after max_batches solves,
+    or when the generator is exhausted (rounds, or no new config for a long
+    run of rounds), and returns the best SolutionResult so far (None if no
+    config was found) with the configs it was computed on. A solve in progress is not interrupted: the budget is
+    checked between configs and after each solve. on_batch, when given, is
+    called after each solve with the result, the number of configs and the
+    elapsed time.
+    """
+    start = time.monotonic()
+    deadline = start + time_budget if time_budget is not None else None
+    configs: List[List[str]] = []
+    solved = 0
+    best = None
+    batches = 0
+
+    session = None
+    if solver == "pulp":
+        from pulpSolver import SolverSession
+        session = SolverSession(M, N, sensors)
+    solve_configs = get_solver(solver)
+
+    def solve_batch() -> None:
+        nonlocal best, solved, batches
+        if session is not None:
+            session.add_columns(configs[solved:])
+            result = session.resolve()
+        else:
+            result = solve_configs(M, N, sensors, configs)
+        solved = len(configs)
+        batches += 1
+        if best is None or result["max_time"] >= best["max_time"]:
+            best = result
+        if on_batch is not None:
+            on_batch(result, solved, time.monotonic() - start)
+
+    try:
+        for config in iter_configs(name, M, N, sensors, rounds, tabu_size, seed, deadline):
+            configs.append(config)
+            if len(configs) - solved >= batch_size:
+                solve_batch()
+                if max_batches is not None and batches >= max_batches:
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+
+        # Last partial batch, unless the budget is already spent and there is an answer
+        out_of_time = deadline is not None and time.monotonic() >= deadline
+        batches_left = max_batches is None or batches < max_batches
+        if len(configs) > solved and batches_left and (best is None or not out_of_time):
+            solve_batch()
+    finally:
+        if session is not None:
+            session.close()
+
+    return best, configs[:solved]
+
+
+def get_solver(name: str) -> Callable:
+    """Returns the solve function of the named backend, imported on first use."""
+    if name not in SOLVER_MODULES:
+        raise ValueError(f"unknown solver : {name}")
+    return importlib.import_module(SOLVER_MODULES[name]).solve
+
+
+def solve(name: str, M: int, N: int, sensors: Dict[str, Dict[str, object]], configs: List[List[str]]):
+    """Solves the LP on configs with the named backend and returns its SolutionResult."""
+    return get_solver(name)(M, N, sensors, configs)
+
+
+class GapTracker:
+    """
+    Optimality-gap stop criterion for the generators.
+
+    The upper bound is util.upperBound. Every `every` calls, the LP is solved
+    with the named solver on the configs found so far; its objective is a
+    lower bound, and the relative gap (upper - lower) / upper is appended to
+    history and passed to report when given. Calling the tracker returns True
+    once the gap is at most tolerance, which stops the generator.
+
+    restore translates the configs the tracker is called with into configs of
+    M, N, sensors before solving (PresolvedInstance.restoreAll when the
+    generator runs on a presolved instance).
+    """
+
+    def __init__(self, M: int, N: int, sensors: Dict[str, Dict[str, object]], tolerance: float = 1e-3,
+                 every: int = 20, solver: str = "pulp", report: Optional[Callable[[Dict[str, float]], None]] = None,
+                 restore: Optional[Callable[[List[List[str]]], List[List[str]]]] = None):
+        self.M = M
+        self.N = N
+        self.sensors = sensors
+        self.tolerance = tolerance
+        self.every = max(1, every)
+        self.solve = get_solver(solver)
+        self.report = report
+        self.restore = restore
+        self.upper = upperBound(M, sensors)
+        self.lower = 0.0
+        self.history: List[Dict[str, float]] = []
+        self.calls = 0
+        self.checked = -1
+
+    @property
+    def gap(self) -> float:
+        if self.upper <= 0:
+            return 0.0
+        return (self.upper - self.lower) / self.upper
+
+    def __call__(self, configs: List[List[str]]) -> bool:
+        self.calls += 1
+        if self.upper <= 0:
+            return True  # some zone is never covered: nothing to generate
+        if self.calls % self.every or len(configs) == self.checked:
+            return False
+
+        self.checked = len(configs)
+        if configs and self.restore is not None:
+            configs = self.restore(configs)
+        if configs:
+            self.lower = max(self.lower, self.solve(self.M, self.N, self.sensors, configs)["max_time"])
+        entry = {"configs": len(configs), "lower": self.lower, "upper": self.upper, "gap": self.gap}
+        self.history.append(entry)
+        if self.report is not None:
+            self.report(entry)
+        return self.gap <= self.tolerance
@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from batchRunner import terminate_group
+from pipeline import get_solver
+from reader import instance_digest
+from resultCache import ResultCache
+from util import validatePool
+
+
+def run_pipeline(messages, M: int, N: int, sensors: Dict[str, Dict[str, object]],
+                 generator: str, nb_rounds: int, tabu_size: int, solver: str,
+                 instance_path: Optional[str] = None, seed: Optional[int] = None) -> None:
+    """
+    Génération, validation puis résolution, exécutées dans le processus worker.
+    La progression et le résultat sont envoyés dans messages sous forme de
+    tuples (type, valeur) : ("stage", nom), ("configs", nombre),
+    ("configurations", liste), ("result", SolutionResult) ou ("error", texte).
+
+    Avec instance_path et une graine, le run passe par le ResultCache : la
+    génération et la résolution sont sautées quand un run identique est déjà
+    en cache. Sans graine, chaque run est un nouveau tirage : le cache n'est
+    ni lu ni écrit.
+    """
+    # Nouveau groupe de processus : l'annulation tue aussi le solveur lancé par ce worker
+    if hasattr(os, "setsid"):
+        os.setsid()
+    # L'annulation envoie SIGTERM : les blocs finally (portfolio) arrêtent leurs processus
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+    try:
+        cache = key = configs = None
+        if instance_path is not None and seed is not None:
+            cache = ResultCache()
+            key = cache.key(instance_digest(instance_path), generator, rounds=nb_rounds, tabu_size=tabu_size,
+                            seed=seed, workers=1)
+            configs = cache.load_configs(key)
+
+        if configs is not None:
+            result = cache.load_result(key, solver, configs)
+            if result is not None:
+                messages.put(("stage", "cache"))
+                messages.put(("configurations", configs))
+                messages.put(("result", result))
+                return
+        else:
+            messages.put(("stage", "génération"))
+            progress = lambda n: messages.put(("configs", n))
+            if generator == "random":
+                from configsGeneratorRandom import generateConfigsRandom
+                configs = generateConfigsRandom(M, N, sensors, nb_rounds, seed=seed, progress=progress)
+            else:
+                from configsGeneratorTabou import generateConfigsTabou
+                configs = generateConfigsTabou(M, N, sensors, nb_rounds, tabu_size, seed=seed, progress=progress)
+            if cache is not None:
+                configs = cache.store_configs(key, N, configs)
+
+        messages.put(("stage", "validation"))
+        report = validatePool(M, sensors, configs)
+        if not report.valid:
+            raise ValueError(report.describe(configs))
+        messages.put(("configurations", configs))
+
+        messages.put(("stage", f"résolution ({solver})"))
+        result = get_solver(solver)(M, N, sensors, configs)
+        if cache is not None:
+            cache.store_result(key, solver, configs, result)
+        messages.put(("result", result))
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class PipelineWorker:
+    """
+    Lance run_pipeline dans un processus séparé, relève ses messages et permet
+    de l'annuler. Le processus n'est pas daemon, pour que le solveur portfolio
+    puisse y lancer ses propres processus : cancel ou close doit le relever.
+    """
+
+    def __init__(self, *args):
+        self.messages = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=run_pipeline, args=(self.messages, *args))
+        self.started = None
+
+    def start(self) -> None:
+        self.started = time.time()
+        self.process.start()
+
+    def elapsed(self) -> float:
+        return time.time() - self.started if self.started is not None else 0.0
+
+    def poll(self) -> List[Tuple[str, object]]:
+        """Renvoie, sans bloquer, les messages arrivés depuis le dernier appel."""
+        received = []
+        while True:
+            try:
+                received.append(self.messages.get_nowait())
+            except queue.Empty:
+                return received
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def cancel(self) -> None:
+        """Arrête le worker et les processus qu'il a pu lancer (solveur, backends du portfolio)."""
+        if self.started is not None:
+            terminate_group(self.process)
+        self.messages.close()
+
+    def close(self) -> None:
+        """Relève le worker une fois qu'il a envoyé son résultat ou son erreur."""
+        if self.started is not None:
+            self.process.join()
+        self.messages.close()
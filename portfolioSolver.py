@@ -0,0 +1,191 @@
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Sequence, TypedDict, Union
+
+from batchRunner import terminate_group
+from instance import Instance
+from util import instanceOf
+
+BACKENDS = ["pulp", "GLPK", "highs"]
+HISTORY_FILE = "portfolio.json"
+# Consecutive wins of one backend on an instance after which it is run alone
+TRUST = 3
+# Seconds a losing backend gets to exit after SIGTERM before it is killed
+GRACE = 2.0
+
+
+class SolutionResult(TypedDict):
+    max_time: float
+    config_activation_times: List[Dict[str, float]]
+
+
+def solve(
+    M: int,
+    N: int,
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
+    configurations: List[List[str]],
+    backends: Sequence[str] = BACKENDS,
+    history: Optional[str] = None,
+    trust: Optional[int] = TRUST
+) -> SolutionResult:
+    """
+    Races several solver backends on the same configurations and returns
+    the first optimal SolutionResult.
+
+    Each backend runs in its own process group, so the solver binary it
+    starts (CBC, glpsol) belongs to that group too. As soon as one backend
+    returns, the others get SIGTERM, which their Python process turns into
+    SystemExit so that the backends' cleanup code runs, and SIGKILL after
+    GRACE seconds. Temporary files go to a directory removed after the race.
+    The backend modules and their dependencies are imported before the
+    processes are forked, so that no backend starts the race late because it
+    still has to import scipy.
+    A backend that fails (solver missing, non-optimal status) drops out of
+    the race; RuntimeError is raised only when they all fail.
+
+    The winner is recorded per instance in the history file (see
+    default_history_path; history=False disables it). Once the same backend
+    has won the last trust races on an instance, it is called directly
+    without racing (trust=None always races). The time recorded is the
+    winner's solve call alone, measured in its process.
+    """
+    key = fingerprint(M, sensors)
+    path = default_history_path() if history is None else history
+    if path and trust is not None:
+        winner = trusted_backend(key, trust, path)
+        if winner is not None and winner in backends:
+            from pipeline import get_solver
+            return get_solver(winner)(M, N, sensors, configurations)
+
+    _preload(backends)
+    workdir = tempfile.mkdtemp(prefix="portfolio-")
+    running = {}  # connection -> (backend, process)
+    errors = {}
+    try:
+        for backend in backends:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_race, daemon=True,
+                                              args=(sender, backend, M, N, sensors, configurations, workdir))
+            process.start()
+            sender.close()
+            running[receiver] = (backend, process)
+
+        while running:
+            for receiver in wait(list(running)):
+                backend, process = running.pop(receiver)
+                try:
+                    status, payload, seconds = receiver.recv()
+                except EOFError:
+                    status, payload = "error", f"exited with code {process.exitcode}"
+                receiver.close()
+                process.join()
+                if status == "ok":
+                    if path:
+                        record_win(key, backend, seconds, path)
+                    return payload
+                errors[backend] = payload
+    finally:
+        for receiver, (backend, process) in running.items():
+            terminate_group(process, GRACE)
+            receiver.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    raise RuntimeError("all portfolio backends failed : "
+                       + ", ".join(f"{backend} : {error}" for backend, error in errors.items()))
+
+
+def _preload(backends: Sequence[str]) -> None:
+    """Imports each backend module, and calls its preload function when it has one."""
+    from pipeline import SOLVER_MODULES
+    for backend in backends:
+        try:
+            module = importlib.import_module(SOLVER_MODULES[backend])
+            if hasattr(module, "preload"):
+                module.preload()
+        except (ImportError, KeyError):
+            pass  # the backend fails again in its process and drops out of the race
+
+
+def _race(connection, backend: str, M: int, N: int, sensors, configurations, workdir: str) -> None:
+    """
+    Runs one backend in a child process and sends back ("ok", result,
+    seconds) or ("error", message, seconds), seconds being the time spent in
+    the backend's solve call.
+    """
+    if hasattr(os, "setsid"):
+        os.setsid()
+    # Let finally blocks (temporary file removal) run when the race is lost
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    os.environ["TMPDIR"] = os.environ["TMP"] = workdir
+    tempfile.tempdir = workdir
+    from pipeline import get_solver
+    start = time.perf_counter()
+    try:
+        message = ("ok", get_solver(backend)(M, N, sensors, configurations), time.perf_counter() - start)
+    except Exception as e:
+        message = ("error", f"{type(e).__name__}: {e}", time.perf_counter() - start)
+    connection.send(message)
+    connection.close()
+
+
+def fingerprint(M: int, sensors: Union[Dict[str, Dict[str, object]], Instance]) -> str:
+    """sha256 of the instance contents: lifetimes and coverage of every sensor."""
+    instance = instanceOf(M, sensors)
+    digest = hashlib.sha256(f"{instance.N} {instance.M}".encode())
+    for data in (instance.life, instance.indptr, instance.zones):
+        digest.update(memoryview(data).cast("B"))
+    return digest.hexdigest()
+
+
+def default_history_path() -> str:
+    from resultCache import default_directory
+    return os.path.join(default_directory(), HISTORY_FILE)
+
+
+def load_history(path: str) -> Dict[str, Dict[str, object]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_win(key: str, backend: str, seconds: float, path: str) -> None:
+    """Adds a win of backend on the instance key to the history file."""
+    history = load_history(path)
+    entry = history.setdefault(key, {"wins": {}, "streak": 0})
+    entry["wins"][backend] = entry["wins"].get(backend, 0) + 1
+    entry["streak"] = entry["streak"] + 1 if entry.get("last") == backend else 1
+    entry["last"] = backend
+    entry["seconds"] = seconds
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def likely_winner(M: int, sensors: Union[Dict[str, Dict[str, object]], Instance],
+                  path: Optional[str] = None) -> Optional[str]:
+    """Backend with the most recorded wins on the instance, or None if it was never raced."""
+    entry = load_history(path or default_history_path()).get(fingerprint(M, sensors))
+    if not entry:
+        return None
+    return max(entry["wins"], key=entry["wins"].get)
+
+
+def trusted_backend(key: str, trust: int, path: str) -> Optional[str]:
+    entry = load_history(path).get(key)
+    if entry and entry.get("streak", 0) >= trust:
+        return entry["last"]
+    return None
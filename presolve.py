@@ -0,0 +1,117 @@
+from typing import Dict, Iterable, List
+
+from util import coverageIndex
+
+
+class InfeasibleInstance(ValueError):
+    """Une zone n'est couverte par aucun capteur : aucune configuration n'existe."""
+
+
+class PresolvedInstance:
+    """
+    Instance réduite par presolve, avec la correspondance vers l'instance d'origine.
+
+    M, N et sensors décrivent l'instance réduite, numérotée de nouveau en
+    s1..sN et z1..zM pour que les générateurs s'y appliquent tels quels :
+    - sensorIds[i] : id d'origine du capteur s{i+1} réduit
+    - zoneIds[j] : ids d'origine des zones fusionnées dans z{j+1}
+    - mandatory : ids d'origine des capteurs présents dans toute configuration
+    - impliedZones : zones d'origine retirées car couvertes dès qu'une autre l'est
+
+    Les configurations élémentaires de l'instance réduite, complétées par
+    mandatory, sont exactement celles de l'instance d'origine : restore()
+    fait cette traduction, et le LP se résout ensuite sur l'instance
+    d'origine (les contraintes des capteurs obligatoires y restent).
+    """
+
+    def __init__(self, originalM: int, originalN: int, sensors: Dict[str, Dict[str, object]],
+                 sensorIds: List[str], zoneIds: List[List[str]], mandatory: List[str], impliedZones: List[str]):
+        self.originalM = originalM
+        self.originalN = originalN
+        self.M = len(zoneIds)
+        self.N = len(sensorIds)
+        self.sensors = sensors
+        self.sensorIds = sensorIds
+        self.zoneIds = zoneIds
+        self.mandatory = mandatory
+        self.impliedZones = impliedZones
+
+    def restore(self, config: Iterable[str]) -> List[str]:
+        """Traduit une configuration de l'instance réduite en ids d'origine."""
+        return self.mandatory + [self.sensorIds[int(s[1:]) - 1] for s in config]
+
+    def restoreAll(self, configs: Iterable[Iterable[str]]) -> List[List[str]]:
+        return [self.restore(c) for c in configs]
+
+    def summary(self) -> str:
+        return (f"M : {self.originalM} -> {self.M}, N : {self.originalN} -> {self.N}, "
+                f"capteurs obligatoires : {len(self.mandatory)}, zones impliquées : {len(self.impliedZones)}")
+
+
+def presolve(M: int, N: int, sensors: Dict[str, Dict[str, object]]) -> PresolvedInstance:
+    """
+    Réduit l'instance avant la génération :
+    1. une zone couverte par aucun capteur lève InfeasibleInstance ;
+    2. un capteur seul à couvrir une zone est obligatoire : il est retiré, et
+       les zones qu'il couvre avec lui ;
+    3. les zones couvertes par le même ensemble de capteurs sont fusionnées ;
+    4. une zone dont l'ensemble de capteurs contient celui d'une autre zone
+       est retirée (couvrir l'autre la couvre) ;
+    5. les capteurs qui ne couvrent plus aucune zone sont retirés.
+
+    Les ensembles de capteurs de chaque zone sont des masques de bits sur les
+    capteurs, comme les masques de zones de util.CoverageIndex.
+    """
+    index = coverageIndex(M, sensors)
+    ids = list(index.masks)
+
+    # Capteurs couvrant chaque zone, bit i pour le capteur ids[i]
+    coveredBy = [0] * M
+    for i, s in enumerate(ids):
+        mask = index.masks[s]
+        while mask:
+            low = mask & -mask
+            coveredBy[low.bit_length() - 1] |= 1 << i
+            mask ^= low
+
+    uncovered = [f"z{j + 1}" for j in range(M) if not coveredBy[j]]
+    if uncovered:
+        raise InfeasibleInstance(f"zones covered by no sensor : {uncovered}")
+
+    mandatoryMask = 0
+    for sensorsOfZone in coveredBy:
+        if sensorsOfZone & (sensorsOfZone - 1) == 0:
+            mandatoryMask |= sensorsOfZone
+    mandatory = [s for i, s in enumerate(ids) if mandatoryMask >> i & 1]
+    fixedZones = index.union(mandatory)
+
+    # Zones restantes regroupées par ensemble de capteurs
+    groups: Dict[int, List[str]] = {}
+    for j in range(M):
+        if not fixedZones >> j & 1:
+            groups.setdefault(coveredBy[j], []).append(f"z{j + 1}")
+
+    # Les plus petits ensembles d'abord : seul un ensemble plus petit peut être inclus dans un autre
+    kept: List[int] = []
+    impliedZones: List[str] = []
+    for sensorsOfZone in sorted(groups, key=int.bit_count):
+        if any(other & ~sensorsOfZone == 0 for other in kept):
+            impliedZones.extend(groups[sensorsOfZone])
+        else:
+            kept.append(sensorsOfZone)
+    kept.sort(key=lambda m: int(groups[m][0][1:]))
+
+    used = 0
+    for sensorsOfZone in kept:
+        used |= sensorsOfZone
+    sensorIds = [s for i, s in enumerate(ids) if used >> i & 1]
+
+    newId = {s: f"s{n + 1}" for n, s in enumerate(sensorIds)}
+    reduced = {newId[s]: {"life": sensors[s]["life"], "coverage": []} for s in sensorIds}
+    for j, sensorsOfZone in enumerate(kept):
+        while sensorsOfZone:
+            low = sensorsOfZone & -sensorsOfZone
+            reduced[newId[ids[low.bit_length() - 1]]]["coverage"].append(f"z{j + 1}")
+            sensorsOfZone ^= low
+
+    return PresolvedInstance(M, N, reduced, sensorIds, [groups[m] for m in kept], mandatory, impliedZones)
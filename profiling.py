@@ -0,0 +1,163 @@
+"""
+Instrumentation of the read -> generate -> validate -> solve pipeline.
+
+Everything is off by default. stage() then returns a shared no-op context
+manager and the hot functions are left untouched: the call counters are
+installed by enable(), which wraps the counted functions in place, and
+removed by disable(). Solver backends report their own iteration count and
+time through record_solver() only while profiling is enabled.
+"""
+import cProfile
+import functools
+import importlib
+import json
+import resource
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+# (module, attribute path, counter name) of the functions counted when enabled
+COUNTED = [
+    ("util", "CoverageIndex.coversAll", "coversAll"),
+    ("util", "CoverageIndex.isElementary", "isElementary"),
+    ("instance", "Instance.coversAll", "coversAll"),
+    ("instance", "Instance.isElementary", "isElementary"),
+    ("configsGeneratorRandom", "generateElementaryIds", "random rounds"),
+    ("configsGeneratorTabou", "bestMove", "tabou rounds"),
+]
+
+enabled = False
+timers: Dict[str, float] = defaultdict(float)
+counters: Dict[str, int] = defaultdict(int)
+solver_runs: List[Dict[str, object]] = []
+
+_NULL_STAGE = nullcontext()
+_originals = []
+
+
+def enable() -> None:
+    """Resets the measurements and installs the call counters."""
+    global enabled
+    if enabled:
+        return
+    reset()
+    for module_name, path, counter in COUNTED:
+        owner = importlib.import_module(module_name)
+        *parents, name = path.split(".")
+        for parent in parents:
+            owner = getattr(owner, parent)
+        original = getattr(owner, name)
+        setattr(owner, name, _counted(counter, original))
+        _originals.append((owner, name, original))
+    enabled = True
+
+
+def disable() -> None:
+    """Restores the uninstrumented functions; measurements are kept."""
+    global enabled
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+    enabled = False
+
+
+def reset() -> None:
+    timers.clear()
+    counters.clear()
+    solver_runs.clear()
+
+
+def _counted(counter: str, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        counters[counter] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def stage(name: str):
+    """Context manager adding the wall time of the block to timers[name]."""
+    if not enabled:
+        return _NULL_STAGE
+    return _timed(name)
+
+
+@contextmanager
+def _timed(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timers[name] += time.perf_counter() - start
+
+
+def record_solver(backend: str, iterations: int, seconds: float) -> None:
+    """Called by the solver backends with the figures reported by the solver."""
+    if enabled:
+        solver_runs.append({"backend": backend, "iterations": iterations, "seconds": seconds})
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process so far, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@contextmanager
+def hotspots(path: str):
+    """
+    Profiles the block and writes the result to path: a pyinstrument HTML
+    report when path ends with .html (pyinstrument must be installed), cProfile
+    stats readable with pstats otherwise.
+    """
+    if path.endswith(".html"):
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+
+def report() -> Dict[str, object]:
+    return {
+        "stages": dict(timers),
+        "counters": dict(counters),
+        "solver": list(solver_runs),
+    }
+
+
+def print_summary() -> None:
+    print(f"{'stage':<24}{'seconds':>12}")
+    for name, seconds in timers.items():
+        print(f"{name:<24}{seconds:>12.4f}")
+    print(f"{'total':<24}{sum(timers.values()):>12.4f}")
+
+    if counters:
+        print(f"\n{'counter':<24}{'calls':>12}")
+        for name, calls in counters.items():
+            print(f"{name:<24}{calls:>12}")
+
+    if solver_runs:
+        print(f"\n{'solver':<24}{'iterations':>12}{'seconds':>12}")
+        for run in solver_runs:
+            print(f"{run['backend']:<24}{run['iterations']:>12}{run['seconds']:>12.4f}")
+
+
+def write_json(path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
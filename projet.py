@@ -1,65 +1,16 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, END
 from tkinter import ttk
-from typing import Dict, List, Tuple
-import random
-import time
-from configsGeneratorRandom import generateConfigsRandom
-from configsGeneratorTabou import generateConfigsTabou
+from typing import Dict
 
+from pipeline import SOLVERS
+from pipelineWorker import PipelineWorker
 from reader import read_data_file
-from pulpSolver import solve as solvePulp
-from GLPKSolver import solve as solveGLPK
-from util import coversAll, isElementary
 
+POLL_MS = 100
 
-
-# Construction d'une configuration élémentaire (une seule)
-def construire_configuration_elementaire(M: int, sensors: Dict[str, Dict[str, object]], k: int = 2) -> List[str]:
-    zones_couvertes = set()
-    toutes_les_zones = {f"z{i+1}" for i in range(M)}
-    capteurs_restants = set(sensors.keys())
-    configuration = []
-
-    while zones_couvertes != toutes_les_zones and capteurs_restants:
-        candidats = []
-        for capteur in capteurs_restants:
-            nouvelles_zones = set(sensors[capteur]['coverage']) - zones_couvertes
-            if nouvelles_zones:
-                candidats.append((capteur, len(nouvelles_zones)))
-
-        if not candidats:
-            break
-
-        candidats.sort(key=lambda x: x[1], reverse=True)
-        limite = min(k, len(candidats))
-        choisi = random.choice(candidats[:limite])[0]
-
-        configuration.append(choisi)
-        zones_couvertes.update(sensors[choisi]['coverage'])
-        capteurs_restants.remove(choisi)
-
-    if zones_couvertes == toutes_les_zones:
-        return configuration
-    else:
-        return []  # échec
-
-# Génération de plusieurs configurations distinctes avec limite de temps/essais
-def generer_configurations_elementaires(M: int, N: int, sensors: Dict[str, Dict[str, object]], k: int = 2) -> List[List[str]]:
-    configurations = []
-    deja_vues = set()
-    nb_attendu = min(5 + (M + N) // 4, 50)
-    limite_temps = min(3 + (M + N) * 0.05, 20)
-
-    debut = time.time()
-    while len(configurations) < nb_attendu and (time.time() - debut) < limite_temps:
-        config = construire_configuration_elementaire(M, sensors, k)
-        config_tri = tuple(sorted(config))
-        if config and config_tri not in deja_vues:
-            configurations.append(config)
-            deja_vues.add(config_tri)
-
-    return configurations
+worker = None
+progress_state = {"stage": "", "configs": 0, "elapsed": 0.0}
 
 
 
@@ -93,32 +44,75 @@ def display_output(filepath: str, M: int, N: int, sensors: Dict[str, Dict[str, o
 
     nb_rounds = int(rounds_input.get())
     tabu_size = int(tabu_input.get())
+    # Sans graine, chaque run est un nouveau tirage et ne passe pas par le cache
+    seed = int(seed_input.get()) if seed_input.get().strip() else None
+
+    # Génération et résolution dans un processus séparé : la fenêtre reste réactive
+    global worker
+    worker = PipelineWorker(M, N, sensors, generator_CB.get(), nb_rounds, tabu_size, solver_CB.get(), filepath,
+                            seed)
+    progress_state.update(stage="démarrage", configs=0)
+    worker.start()
+    btn.config(state='disabled')
+    cancel_btn.config(state='normal')
+    root.after(POLL_MS, poll_worker)
+
+# Relève les messages du worker et met à jour la progression
+def poll_worker():
+    if worker is None:
+        return
 
-    if generator_CB.get() == "random" :
-        configs = generateConfigsRandom(M,N,sensors,nb_rounds)
-    else :
-        configs = generateConfigsTabou(M,N,sensors,nb_rounds,tabu_size)
-
-    for c in configs :
-        if not coversAll(M,N,sensors,c):
-            raise f"config : {c} does not cover all"
-
-        if not isElementary(M,N,sensors,c):
-            raise f"config : {c} is not elementary"
-
-    output_text.insert(tk.END, "\nConfigurations élémentaires générées :\n")
-    for i, cfg in enumerate(configs, 1):
-        output_text.insert(tk.END, f"  {i}. {cfg}\n")
-
-    solver = solver_CB.get()
-    if solver == "pulp":
-        print("solving with pulp !")
-        result = solvePulp(M,N,sensors,configs)
-    else :
-        print("solving with GLPK !")
-        result = solveGLPK(M,N,sensors,configs)
+    for kind, value in worker.poll():
+        if kind == "stage":
+            progress_state["stage"] = value
+        elif kind == "configs":
+            progress_state["configs"] = value
+        elif kind == "configurations":
+            output_text.insert(tk.END, "\nConfigurations élémentaires générées :\n")
+            for i, cfg in enumerate(value, 1):
+                output_text.insert(tk.END, f"  {i}. {cfg}\n")
+        elif kind == "result":
+            output_text.insert(tk.END,f"resultat : {value}")
+            finish_worker("terminé")
+            return
+        elif kind == "error":
+            finish_worker("erreur")
+            messagebox.showerror("Erreur", value)
+            return
+
+    if not worker.is_alive():
+        finish_worker("interrompu")
+        return
 
-    output_text.insert(tk.END,f"resultat : {result}")
+    show_progress()
+    root.after(POLL_MS, poll_worker)
+
+def cancel_worker():
+    if worker is not None:
+        worker.cancel()
+        finish_worker("annulé")
+
+def finish_worker(stage: str):
+    global worker
+    progress_state["stage"] = stage
+    show_progress()
+    worker.close()
+    worker = None
+    btn.config(state='normal')
+    cancel_btn.config(state='disabled')
+
+# Le worker n'est pas daemon : il est arrêté avant la fermeture de la fenêtre
+def close_window():
+    if worker is not None:
+        worker.cancel()
+    root.destroy()
+
+def show_progress():
+    elapsed = worker.elapsed() if worker is not None else progress_state["elapsed"]
+    progress_state["elapsed"] = elapsed
+    progress_label.set(f"Étape : {progress_state['stage']} | "
+                       f"configs trouvées : {progress_state['configs']} | "
+                       f"temps écoulé : {elapsed:.1f} s")
 
 # Interface utilisateur principale
 root = tk.Tk()
@@ -128,6 +122,12 @@ root.geometry("500x400")
 btn = tk.Button(root, text="Sélectionner un fichier", command=select_file)
 btn.pack(pady=10)
 
+cancel_btn = tk.Button(root, text="Annuler", command=cancel_worker, state='disabled')
+cancel_btn.pack(pady=5)
+
+progress_label = tk.StringVar()
+tk.Label(root,textvariable=progress_label).pack(pady=5)
+
 generator_label = tk.StringVar()
 generator_label.set("Configs generation algorithm : ")
 tk.Label(root,textvariable=generator_label).pack(pady=5)
@@ -149,14 +149,21 @@ rounds_input = tk.Entry(root)
 rounds_input.insert(END,"100")
 rounds_input.pack(pady=10)
 
+seed_label = tk.StringVar()
+seed_label.set("Seed (vide : sans cache) : ")
+tk.Label(root,textvariable=seed_label).pack(pady=5)
+seed_input = tk.Entry(root)
+seed_input.pack(pady=10)
+
 generator_label = tk.StringVar()
 generator_label.set("Solver implementation : ")
 tk.Label(root,textvariable=generator_label).pack(pady=5)
 solver_CB = ttk.Combobox(root)
-solver_CB["values"] = ["pulp","GLPK"]
+solver_CB["values"] = SOLVERS
 solver_CB.pack(pady=10)
 
 output_text = scrolledtext.ScrolledText(root, wrap='word', state='disabled')
 output_text.pack(fill='both', expand=True, padx=10, pady=10)
 
+root.protocol("WM_DELETE_WINDOW", close_window)
 root.mainloop()
\ No newline at end of file
@@ -1,6 +1,13 @@
-from typing import Dict, List, TypedDict
+import os
+import re
+from tempfile import NamedTemporaryFile
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict, Union
 import pulp as pl
 
+import profiling
+from instance import Instance
+from modelBuilder import build_lifetime_rows
+
 class SolutionResult(TypedDict):
     max_time: float
     config_activation_times: List[Dict[str, float]]
@@ -8,7 +15,7 @@ class SolutionResult(TypedDict):
 def solve(
     M: int,
     N: int,
-    sensors: Dict[str, Dict[str, object]],
+    sensors: Union[Dict[str, Dict[str, object]], Instance],
     configurations: List[List[str]]
 ) -> SolutionResult:
     """
@@ -17,7 +24,8 @@ def solve(
     Args:
         M: Number of zones (unused but kept for interface)
         N: Number of sensors (unused but kept for interface)
-        sensors: Dictionary mapping sensor IDs to their properties (must include 'life')
+        sensors: Dictionary mapping sensor IDs to their properties (must include 'life'),
+            or an Instance, in which case each configuration is a sequence of sensor indices
         configurations: List of valid configurations (each configuration is a list of sensor IDs)
     
     Returns:
@@ -28,6 +36,12 @@ def solve(
             - 'config': List[str] - The sensor IDs in this configuration
             - 'time': float - The activation duration for this configuration
     """
+    prob, config_vars = _build_problem(sensors, configurations)
+    return _solve_problem(prob, config_vars, configurations)
+
+def _build_problem(sensors: Dict[str, Dict[str, object]],
+                   configurations: List[List[str]]) -> Tuple[pl.LpProblem, List[pl.LpVariable]]:
+    """Builds the scheduling LP: one variable per configuration, one constraint per sensor."""
     # Create the LP problem
     prob = pl.LpProblem("OptimalSensorScheduling", pl.LpMaximize)
     
@@ -41,20 +55,35 @@ def solve(
     prob += pl.lpSum(config_vars), "TotalSurveillanceTime"
     
     # Add constraints for each sensor's lifetime
-    for sensor_id, sensor_data in sensors.items():
-        relevant_configs = [
-            config_vars[i]
-            for i, config in enumerate(configurations)
-            if sensor_id in config
-        ]
-        if relevant_configs:
-            prob += (
-                pl.lpSum(relevant_configs) <= sensor_data['life'],
-                f"LifetimeConstraint_{sensor_id}"
-            )
-    
+    for sensor_id, columns, life in build_lifetime_rows(sensors, configurations):
+        relevant_configs = pl.LpAffineExpression([(config_vars[i], 1) for i in columns])
+        prob += (
+            relevant_configs <= life,
+            f"LifetimeConstraint_{sensor_id}"
+        )
+
+    return prob, config_vars
+
+def _solve_problem(prob: pl.LpProblem,
+                   config_vars: List[pl.LpVariable],
+                   configurations: List[List[str]],
+                   solver: Optional[pl.LpSolver] = None,
+                   **solve_kwargs) -> SolutionResult:
+    """Runs CBC on a built problem and collects the activation times."""
+    solver = solver or pl.PULP_CBC_CMD(msg=False)
+    log_path = None
+    if profiling.enabled:
+        with NamedTemporaryFile(suffix='.log', delete=False) as log_file:
+            log_path = log_file.name
+        solver.optionsDict['logPath'] = log_path
+
     # Solve the problem
-    status = prob.solve(pl.PULP_CBC_CMD(msg=False))
+    try:
+        status = prob.solve(solver, **solve_kwargs)
+    finally:
+        if log_path is not None:
+            solver.optionsDict.pop('logPath', None)
+            _record_cbc_log(log_path)
     
     if status != pl.LpStatusOptimal:
         raise RuntimeError(f"Optimization failed with status: {pl.LpStatus[status]}")
@@ -72,4 +101,139 @@ def solve(
     return {
         'max_time': float(pl.value(prob.objective)),
         'config_activation_times': activation_times
-    }
\ No newline at end of file
+    }
+
+_CBC_ITERATIONS_RE = re.compile(r'(\d+) iterations time ([\d.]+)')
+
+def _record_cbc_log(log_path: str) -> None:
+    """Reports the iterations and time found in a CBC log to profiling."""
+    try:
+        with open(log_path, 'r') as f:
+            runs = _CBC_ITERATIONS_RE.findall(f.read())
+    finally:
+        os.unlink(log_path)
+    profiling.record_solver(
+        'pulp',
+        sum(int(iterations) for iterations, _ in runs),
+        sum(float(seconds) for _, seconds in runs)
+    )
+
+class SolverSession:
+    """
+    Keeps the scheduling LP alive between solves.
+
+    Columns and lifetime changes are applied to the existing LpProblem
+    instead of rebuilding it, and each resolve() warm-starts CBC from the
+    basis saved by the previous one (CBC basisI/basisO files). The model is
+    passed to CBC as an LP file so that the basis refers to stable variable
+    and constraint names.
+
+    sensors may also be an Instance, with configurations given as sequences
+    of sensor indices, as for solve.
+
+    Usage:
+        with SolverSession(M, N, sensors, configs) as session:
+            result = session.resolve()
+            session.add_columns(more_configs)
+            session.update_lifetimes({'s3': 12.0})
+            result = session.resolve()
+    """
+
+    def __init__(
+        self,
+        M: int,
+        N: int,
+        sensors: Union[Dict[str, Dict[str, object]], Instance],
+        configurations: Iterable[List[str]] = (),
+        warm_start: bool = True
+    ):
+        self.M = M
+        self.N = N
+        self.native = isinstance(sensors, Instance)
+        if self.native:
+            self.lifetimes = {Instance.sensorId(i): float(life) for i, life in enumerate(sensors.life)}
+        else:
+            self.lifetimes = {sensor_id: float(data['life']) for sensor_id, data in sensors.items()}
+        self.warm_start = warm_start
+        self.configurations: List[List[str]] = []
+        self.config_vars: List[pl.LpVariable] = []
+        self.prob = pl.LpProblem("OptimalSensorScheduling", pl.LpMaximize)
+        self.prob += pl.LpAffineExpression(), "TotalSurveillanceTime"
+        self._basis_path: Optional[str] = None
+        self._has_basis = False
+        self.add_columns(configurations)
+
+    def add_columns(self, configurations: Iterable[List[str]]) -> None:
+        """Adds one activation variable per configuration to the live model."""
+        for config in configurations:
+            var = pl.LpVariable(f"t_{len(self.config_vars)}", lowBound=0)
+            self.prob.addVariable(var)
+            self.prob.objective.addInPlace(var)
+
+            for sensor_id in set(Instance.toSensorIds(config) if self.native else config):
+                if sensor_id not in self.lifetimes:
+                    continue
+                name = f"LifetimeConstraint_{sensor_id}"
+                constraint = self.prob.constraints.get(name)
+                if constraint is None:
+                    self.prob += (
+                        pl.LpAffineExpression([(var, 1)]) <= self.lifetimes[sensor_id],
+                        name
+                    )
+                else:
+                    constraint.addInPlace(var)
+
+            self.config_vars.append(var)
+            self.configurations.append(config)
+
+    def update_lifetimes(self, lifetimes: Dict[str, float]) -> None:
+        """Changes the right-hand side of the given sensors' lifetime constraints."""
+        for sensor_id, life in lifetimes.items():
+            if sensor_id not in self.lifetimes:
+                raise KeyError(f"Unknown sensor: {sensor_id}")
+            self.lifetimes[sensor_id] = float(life)
+            constraint = self.prob.constraints.get(f"LifetimeConstraint_{sensor_id}")
+            if constraint is not None:
+                constraint.changeRHS(float(life))
+
+    def resolve(self) -> SolutionResult:
+        """Solves the current model, starting from the previous optimal basis if any."""
+        options = []
+        if self.warm_start:
+            if self._basis_path is None:
+                with NamedTemporaryFile(suffix='.bas', delete=False) as basis_file:
+                    self._basis_path = basis_file.name
+            if self._has_basis:
+                options.append(f"basisI {self._basis_path}")
+            options += ["initialSolve", f"basisO {self._basis_path}"]
+
+        solver = pl.PULP_CBC_CMD(msg=False, mip=False, options=options)
+        result = _solve_problem(self.prob, self.config_vars, self.configurations,
+                                solver, use_mps=False)
+        self._has_basis = self.warm_start
+        return result
+
+    def duals(self) -> Dict[str, float]:
+        """
+        Dual price of each sensor's lifetime constraint after the last
+        resolve; sensors that appear in no configuration get 0.
+        """
+        duals = {}
+        for sensor_id in self.lifetimes:
+            constraint = self.prob.constraints.get(f"LifetimeConstraint_{sensor_id}")
+            duals[sensor_id] = float(constraint.pi or 0.0) if constraint is not None else 0.0
+        return duals
+
+    def close(self) -> None:
+        """Removes the saved basis file."""
+        if self._basis_path is not None:
+            if os.path.exists(self._basis_path):
+                os.unlink(self._basis_path)
+            self._basis_path = None
+            self._has_basis = False
+
+    def __enter__(self) -> "SolverSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,8 +1,22 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple
 
-from typing import Dict, Tuple
+from instance import Instance
 
+# En-tête du cache binaire : magic, version, N, M, nnz, sha256 du fichier source
+_CACHE_MAGIC = b"SNSR"
+_CACHE_VERSION = 2
+_CACHE_HEADER = struct.Struct("<4sIIIQ32s")
+_CACHE_HEADER_SIZE = 64
+CACHE_SUFFIX = ".cache"
 
-def read_data_file(filepath: str) -> Tuple[int, int, Dict[str, Dict[str, object]]]:
+
+def read_data_file(filepath: str, use_cache: bool = True) -> Tuple[int, int, Dict[str, Dict[str, object]]]:
     """
     Lit les données depuis un fichier texte structuré comme suit :
     - Ligne 1 : nombre de capteurs (N)
@@ -10,23 +24,150 @@ def read_data_file(filepath: str) -> Tuple[int, int, Dict[str, Dict[str, object]
     - Ligne 3 : durées de vie des N capteurs
     - Lignes suivantes : pour chaque capteur, les zones qu’il couvre
 
+    Les données passent par read_instance (cache binaire compris) ; sensors
+    est une vue paresseuse qui ne construit le dictionnaire d'un capteur
+    qu'au premier accès. L'Instance sous-jacente est sensors.instance.
+
     Retourne :
     - M : nombre de zones
     - N : nombre de capteurs
     - sensors : dictionnaire {id capteur: {coverage, life}}
     """
-    sensors: Dict[str, Dict[str, object]] = {}
-    with open(filepath, 'r') as f:
-        N = int(f.readline().strip())
-        M = int(f.readline().strip())
-        durabilities = list(map(float, f.readline().strip().split()))
-        if len(durabilities) != N:
-            raise ValueError(f"{len(durabilities)} durées trouvées, attendu : {N}")
-        for i in range(N):
-            line = f.readline().strip()
-            if not line:
-                raise ValueError(f"Données manquantes pour capteur #{i+1}")
-            zones = line.split()
-            coverage = [f"z{int(z)}" for z in zones]
-            sensors[f"s{i+1}"] = {"coverage": coverage, "life": durabilities[i]}
-    return M, N, sensors
\ No newline at end of file
+    instance = read_instance(filepath, use_cache)
+    return instance.M, instance.N, SensorsView(instance)
+
+
+class SensorsView(Mapping):
+    """Vue {id capteur: {coverage, life}} construite à la demande sur une Instance."""
+
+    def __init__(self, instance: Instance):
+        self.instance = instance
+        self._built: Dict[str, Dict[str, object]] = {}
+
+    def __getitem__(self, sensor_id: str) -> Dict[str, object]:
+        data = self._built.get(sensor_id)
+        if data is None:
+            if not sensor_id.startswith("s") or not sensor_id[1:].isdigit():
+                raise KeyError(sensor_id)
+            i = int(sensor_id[1:]) - 1
+            if not 0 <= i < self.instance.N:
+                raise KeyError(sensor_id)
+            data = {
+                "coverage": [f"z{z + 1}" for z in self.instance.coverage(i)],
+                "life": self.instance.life[i],
+            }
+            self._built[sensor_id] = data
+        return data
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self.instance.N):
+            yield f"s{i+1}"
+
+    def __len__(self) -> int:
+        return self.instance.N
+
+    def __repr__(self) -> str:
+        # Même affichage que le dictionnaire sensors d'origine
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        # Les tableaux mappés ne se sérialisent pas : on envoie un vrai dict
+        return (dict, (dict(self.items()),))
+
+
+def instance_digest(filepath: str) -> str:
+    """Empreinte sha256 (hexadécimale) du contenu du fichier d'instance."""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_instance(filepath: str, use_cache: bool = True) -> Instance:
+    """
+    Lit une instance sous forme de tableaux (zones numérotées à partir de 0). Avec use_cache, un fichier
+    binaire filepath + CACHE_SUFFIX est écrit à côté de la source et réutilisé
+    (mappé en mémoire) tant que l'empreinte sha256 du fichier source correspond.
+    """
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).digest()
+    cache_path = filepath + CACHE_SUFFIX
+
+    if use_cache:
+        instance = _load_cache(cache_path, digest)
+        if instance is not None:
+            return instance
+
+    instance = _parse(content)
+
+    if use_cache:
+        try:
+            _write_cache(cache_path, digest, instance)
+        except OSError:
+            pass  # répertoire en lecture seule : on se passe du cache
+
+    return instance
+
+
+def _parse(content: bytes) -> Instance:
+    lines = content.split(b"\n")
+    N = int(lines[0].strip())
+    M = int(lines[1].strip())
+    life = array('d', map(float, lines[2].split()))
+    if len(life) != N:
+        raise ValueError(f"{len(life)} durées trouvées, attendu : {N}")
+
+    indptr = array('q', [0])
+    zones = array('i')
+    for i in range(N):
+        fields = lines[3 + i].split() if 3 + i < len(lines) else []
+        if not fields:
+            raise ValueError(f"Données manquantes pour capteur #{i+1}")
+        covered = array('i', map(int, fields))
+        if min(covered) < 1 or max(covered) > M:
+            bad = next(z for z in covered if not 1 <= z <= M)
+            raise ValueError(f"ligne {4 + i} : zone {bad} hors de 1..{M} (capteur #{i+1})")
+        zones.extend(covered)
+        indptr.append(len(zones))
+
+    # Numéros de zones du fichier (à partir de 1) -> indices
+    zones = array('i', [z - 1 for z in zones])
+    return Instance(N, M, life, indptr, zones)
+
+
+def _write_cache(cache_path: str, digest: bytes, instance: Instance) -> None:
+    header = _CACHE_HEADER.pack(_CACHE_MAGIC, _CACHE_VERSION, instance.N, instance.M,
+                                len(instance.zones), digest)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(_CACHE_HEADER_SIZE, b"\0"))
+        f.write(array('d', instance.life).tobytes())
+        f.write(array('q', instance.indptr).tobytes())
+        f.write(array('i', instance.zones).tobytes())
+    os.replace(tmp_path, cache_path)
+
+
+def _load_cache(cache_path: str, digest: bytes):
+    try:
+        with open(cache_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _CACHE_HEADER_SIZE:
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    magic, version, N, M, nnz, cached_digest = _CACHE_HEADER.unpack_from(buffer)
+    expected = _CACHE_HEADER_SIZE + 8 * N + 8 * (N + 1) + 4 * nnz
+    if magic != _CACHE_MAGIC or version != _CACHE_VERSION or cached_digest != digest \
+            or len(buffer) != expected:
+        buffer.close()
+        return None
+
+    view = memoryview(buffer)
+    offset = _CACHE_HEADER_SIZE
+    life = view[offset:offset + 8 * N].cast('d')
+    offset += 8 * N
+    indptr = view[offset:offset + 8 * (N + 1)].cast('q')
+    offset += 8 * (N + 1)
+    zones = view[offset:offset + 4 * nnz].cast('i')
+
+    return Instance(N, M, life, indptr, zones, buffer)
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from configPool import ConfigPool
+from pipeline import generate, solve
+from reader import instance_digest, read_data_file
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CONFIGS_SUFFIX = ".cfgp"
+RESULT_SUFFIX = ".json"
+
+
+def default_directory() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "capteurs")
+
+
+class ResultCache:
+    """
+    Cache disque des runs read -> generate -> solve.
+
+    Une entrée de configurations est identifiée par l'empreinte sha256 du
+    fichier d'instance, le nom du générateur et ses paramètres (graine
+    comprise) ; elle est stockée au format binaire de ConfigPool. Les
+    résultats de chaque solveur sont stockés à côté (clé + solveur), sous la
+    forme max_time et (indice de configuration, durée) : changer de solveur
+    réutilise les configurations sans relancer la génération. Un solveur qui
+    génère ses propres colonnes (colgen) les stocke dans son résultat.
+
+    La taille totale du répertoire est bornée par max_bytes : les entrées
+    les moins récemment utilisées (date de modification, mise à jour à
+    chaque lecture) sont supprimées en premier.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(digest: str, generator: str, **params) -> str:
+        """Clé des configurations : empreinte de l'instance, générateur et paramètres."""
+        description = json.dumps({"instance": digest, "generator": generator, **params}, sort_keys=True)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def load_configs(self, key: str) -> Optional[List[List[str]]]:
+        path = self._path(key + CONFIGS_SUFFIX)
+        try:
+            configs = ConfigPool.load(path).configs()
+        except (OSError, ValueError):
+            return None
+        _touch(path)
+        return configs
+
+    def store_configs(self, key: str, N: int, configs: List[List[str]]) -> List[List[str]]:
+        """Stocke les configurations ; renvoie celles qui seront relues du cache (sans doublon, capteurs triés)."""
+        pool = ConfigPool(N)
+        pool.update(configs)
+        self._write(key + CONFIGS_SUFFIX, pool.save)
+        return pool.configs()
+
+    def load_result(self, key: str, solver: str, configs: List[List[str]]):
+        """Résultat du solveur sur les configurations de key (et les colonnes stockées avec lui), ou None."""
+        path = self._path(f"{key}.{solver}{RESULT_SUFFIX}")
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            columns = configs + stored.get("columns", [])
+            activation_times = [{"config": columns[i], "time": time} for i, time in stored["times"]]
+        except (OSError, ValueError, KeyError, IndexError):
+            return None
+        _touch(path)
+        return {"max_time": stored["max_time"], "config_activation_times": activation_times}
+
+    def store_result(self, key: str, solver: str, configs: List[List[str]], result) -> None:
+        """
+        Stocke le résultat du solveur. Les configurations absentes de
+        configs (colonnes générées par le solveur lui-même, cf.
+        columnGeneration) sont stockées avec lui, à la suite de celles de key.
+        """
+        positions = {ConfigPool.toMask(c): i for i, c in enumerate(configs)}
+        columns = []
+        times = []
+        for entry in result["config_activation_times"]:
+            mask = ConfigPool.toMask(entry["config"])
+            if mask not in positions:
+                positions[mask] = len(configs) + len(columns)
+                columns.append(list(entry["config"]))
+            times.append([positions[mask], entry["time"]])
+        stored = {"max_time": result["max_time"], "times": times}
+        if columns:
+            stored["columns"] = columns
+
+        def write(path: str) -> None:
+            with open(path, "w") as f:
+                json.dump(stored, f, separators=(",", ":"))
+
+        self._write(f"{key}.{solver}{RESULT_SUFFIX}", write)
+
+    def _write(self, name: str, writer) -> None:
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à repasser
+        sous max_bytes. Les configurations d'une clé et les résultats de ses
+        solveurs partent ensemble : un résultat sans ses configurations est
+        inutilisable.
+        """
+        groups: Dict[str, List] = {}  # clé -> [dernier accès, taille, fichiers]
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith((CONFIGS_SUFFIX, RESULT_SUFFIX)):
+                    stat = entry.stat()
+                    group = groups.setdefault(entry.name.split(".", 1)[0], [0.0, 0, []])
+                    group[0] = max(group[0], stat.st_mtime)
+                    group[1] += stat.st_size
+                    group[2].append(entry.path)
+                    total += stat.st_size
+
+        for _, size, paths in sorted(groups.values()):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def run(self, filepath: str, generator: str, solver: str, rounds: int = 100, tabu_size: int = 10,
+            seed: Optional[int] = None, workers: int = 1) -> Tuple[List[List[str]], Dict[str, object], str]:
+        """
+        read -> generate -> solve à travers le cache. Renvoie les
+        configurations, le SolutionResult et l'origine du résultat : "hit"
+        (tout venait du cache), "configs" (configurations en cache, LP résolu)
+        ou "miss". Sans graine, le run n'est pas reproductible : il est
+        exécuté sans lire ni écrire le cache, avec l'origine "uncached".
+        workers fait partie de la clé : pour une même graine, les
+        configurations dépendent du nombre de processus de génération.
+        """
+        if seed is None:
+            M, N, sensors = read_data_file(filepath)
+            configs = generate(generator, M, N, sensors, rounds, tabu_size, workers=workers)
+            return configs, solve(solver, M, N, sensors, configs), "uncached"
+
+        key = self.key(instance_digest(filepath), generator, rounds=rounds, tabu_size=tabu_size, seed=seed,
+                       workers=workers)
+        configs = self.load_configs(key)
+        if configs is not None:
+            result = self.load_result(key, solver, configs)
+            if result is not None:
+                return configs, result, "hit"
+
+        M, N, sensors = read_data_file(filepath)
+        status = "configs"
+        if configs is None:
+            status = "miss"
+            configs = self.store_configs(key, N, generate(generator, M, N, sensors, rounds, tabu_size, seed,
+                                                          workers=workers))
+
+        result = solve(solver, M, N, sensors, configs)
+        self.store_result(key, solver, configs, result)
+        return configs, result, status
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
@@ -0,0 +1,26 @@
+import itertools
+import random
+from typing import Dict, FrozenSet, Set
+
+
+def randomSensors(rng: random.Random, M: int, N: int, maxZones: int = 3) -> Dict[str, Dict[str, object]]:
+    """Capteurs s1..sN couvrant chacun entre 1 et maxZones zones parmi z1..zM."""
+    return {
+        f"s{i + 1}": {"life": float(rng.randint(1, 20)),
+                      "coverage": [f"z{j + 1}" for j in rng.sample(range(M), rng.randint(1, min(maxZones, M)))]}
+        for i in range(N)
+    }
+
+
+def minimalCovers(M: int, sensors: Dict[str, Dict[str, object]]) -> Set[FrozenSet[str]]:
+    """Toutes les configurations élémentaires, par énumération des sous-ensembles de capteurs."""
+    zones = {s: set(data["coverage"]) for s, data in sensors.items()}
+    everything = {f"z{j + 1}" for j in range(M)}
+    covers = set()
+    for size in range(1, len(zones) + 1):
+        for subset in itertools.combinations(zones, size):
+            if set().union(*(zones[s] for s in subset)) != everything:
+                continue
+            if all(set().union(*(zones[t] for t in subset if t != s)) != everything for s in subset):
+                covers.add(frozenset(subset))
+    return covers
@@ -0,0 +1,88 @@
+import subprocess
+
+import pytest
+
+import GLPKSolver
+
+# Sortie de glpsol --output : colonnes de base (B) et hors base (NL, NU),
+# marginaux "< eps", nom trop long imprimé seul sur sa ligne.
+SOLUTION = """\
+Problem:
+Rows:       3
+Columns:    5
+Non-zeros:  7
+Status:     OPTIMAL
+Objective:  obj = 8.5 (MAXimum)
+
+   No.   Row name   St   Activity     Lower bound   Upper bound    Marginal
+------ ------------ -- ------------- ------------- ------------- -------------
+     1 r_1          NU             6                           6           0.5
+     2 r_2          B            2.5                           3
+     3 r_3          NU             6                           6         < eps
+
+   No. Column name  St   Activity     Lower bound   Upper bound    Marginal
+------ ------------ -- ------------- ------------- ------------- -------------
+     1 t0           B            3.5             0
+     2 t1           NL             0             0                       < eps
+     3 t2           B              5             0
+     4 t3           NL             0             0                        -0.5
+     5 a_very_long_column_name
+                    B              2             0
+
+Karush-Kuhn-Tucker optimality conditions:
+
+KKT.PE: max.abs.err = 0.00e+00 on row 0
+"""
+
+CONFIGS = [["s1", "s2"], ["s1", "s3"], ["s2", "s4"], ["s3"]]
+
+
+def _activation(result):
+    return [(entry["config"], entry["time"]) for entry in result["config_activation_times"]]
+
+
+def test_parse_solution(tmp_path):
+    path = tmp_path / "model.sol"
+    path.write_text(SOLUTION)
+
+    result = GLPKSolver._parse_glpk_solution(str(path), CONFIGS)
+
+    assert result["max_time"] == 8.5
+    assert _activation(result) == [(["s1", "s2"], 3.5), (["s2", "s4"], 5.0)]
+
+
+def test_parse_solution_ignores_columns_past_the_configurations(tmp_path):
+    path = tmp_path / "model.sol"
+    path.write_text(SOLUTION)
+
+    result = GLPKSolver._parse_glpk_solution(str(path), CONFIGS[:1])
+
+    assert _activation(result) == [(["s1", "s2"], 3.5)]
+
+
+@pytest.mark.parametrize("has_stdin", [True, False])
+def test_solve_uses_a_temporary_lp_file_without_stdin(tmp_path, monkeypatch, has_stdin):
+    stdin = tmp_path / "stdin"
+    if has_stdin:
+        stdin.touch()
+    monkeypatch.setattr(GLPKSolver, "_STDIN", str(stdin))
+    calls = []
+
+    def run(cmd, input=None, **kwargs):
+        lp_path = cmd[cmd.index("--cpxlp") + 1]
+        model = input if lp_path == str(stdin) else open(lp_path).read()
+        calls.append((lp_path, model))
+        with open(cmd[cmd.index("--output") + 1], "w") as f:
+            f.write(SOLUTION)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(GLPKSolver.subprocess, "run", run)
+    sensors = {f"s{i}": {"life": 6, "coverage": ["z1"]} for i in range(1, 5)}
+
+    result = GLPKSolver.solve(1, 4, sensors, CONFIGS, workdir=str(tmp_path))
+
+    [(lp_path, model)] = calls
+    assert (lp_path == str(stdin)) == has_stdin
+    assert model.startswith("Maximize")
+    assert result["max_time"] == 8.5
+    assert sorted(p.name for p in tmp_path.iterdir()) == (["stdin"] if has_stdin else [])
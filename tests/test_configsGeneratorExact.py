@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from configsGeneratorExact import generateConfigsExact, iterElementaryCovers
+from helpers import minimalCovers, randomSensors
+from instance import Instance
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_enumeration_matches_brute_force(seed):
+    rng = random.Random(seed)
+    M, N = rng.randint(1, 8), rng.randint(1, 10)
+    sensors = randomSensors(rng, M, N, maxZones=4)
+
+    covers = [frozenset(Instance.toSensorIds(c)) for c in iterElementaryCovers(Instance.fromSensors(M, N, sensors))]
+
+    assert len(covers) == len(set(covers))
+    assert set(covers) == minimalCovers(M, sensors)
+
+
+def test_generate_returns_every_config_without_fallback_when_complete():
+    sensors = randomSensors(random.Random(0), 6, 8, maxZones=4)
+
+    configs = generateConfigsExact(6, 8, sensors, fallbackRounds=0)
+
+    assert {frozenset(c) for c in configs} == minimalCovers(6, sensors)
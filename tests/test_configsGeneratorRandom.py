@@ -0,0 +1,17 @@
+import random
+
+from configsGeneratorRandom import generateConfigsRandom
+from helpers import randomSensors
+
+
+def test_parallel_generation_honours_stop():
+    sensors = randomSensors(random.Random(0), 4, 12, maxZones=2)
+    sensors["s1"]["coverage"] = ["z1", "z2"]
+    sensors["s2"]["coverage"] = ["z3", "z4"]
+
+    full = generateConfigsRandom(4, 12, sensors, rounds=200, workers=2, seed=1)
+    stopped = generateConfigsRandom(4, 12, sensors, rounds=200, workers=2, seed=1,
+                                    stop=lambda found: len(found) >= 3)
+
+    assert len(full) > 3
+    assert stopped == full[:3]
@@ -0,0 +1,27 @@
+import random
+
+import pytest
+
+from helpers import minimalCovers, randomSensors
+from presolve import InfeasibleInstance, presolve
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_restore_gives_the_original_elementary_configs(seed):
+    rng = random.Random(seed)
+    M, N = rng.randint(1, 7), rng.randint(1, 8)
+    sensors = randomSensors(rng, M, N)
+    covered = {z for data in sensors.values() for z in data["coverage"]}
+
+    if len(covered) < M:
+        with pytest.raises(InfeasibleInstance):
+            presolve(M, N, sensors)
+        return
+
+    reduced = presolve(M, N, sensors)
+    if reduced.M == 0:
+        restored = {frozenset(reduced.mandatory)}
+    else:
+        restored = {frozenset(c) for c in reduced.restoreAll(minimalCovers(reduced.M, reduced.sensors))}
+
+    assert restored == minimalCovers(M, sensors)
@@ -1,9 +1,248 @@
+from typing import Dict, Iterable, List
+
+from instance import Instance
+
+
+class CoverageIndex:
+    """
+    Représentation précalculée de la couverture d'une instance.
+
+    Chaque capteur est encodé par un masque de bits (entier Python) dont le
+    bit j-1 vaut 1 si le capteur couvre la zone z{j}. zoneCounts[j-1] donne le
+    nombre de capteurs de l'instance couvrant la zone z{j}.
+
+    sensors peut être une Instance ou une vue sur une Instance (reader.SensorsView) :
+    les masques sont alors repris de l'Instance, sans relire les "z{j}".
+    """
+
+    def __init__(self, M: int, sensors: Dict[str, Dict[str, object]]):
+        self.M = M
+        self.full = (1 << M) - 1
+        self.masks: Dict[str, int] = {}
+        self.zoneCounts: List[int] = [0] * M
+
+        instance = sensors if isinstance(sensors, Instance) else getattr(sensors, "instance", None)
+        if isinstance(instance, Instance) and instance.M == M:
+            masks = {f"s{i + 1}": mask for i, mask in enumerate(instance.masks)}
+        else:
+            masks = {}
+            for s, data in sensors.items():
+                mask = 0
+                for cov in data["coverage"]:
+                    mask |= 1 << (int(cov[1:]) - 1)
+                masks[s] = mask & self.full
+
+        for s, mask in masks.items():
+            self.masks[s] = mask
+
+            bits = mask
+            while bits:
+                low = bits & -bits
+                self.zoneCounts[low.bit_length() - 1] += 1
+                bits ^= low
+
+    def union(self, chosen: Iterable[str]) -> int:
+        covered = 0
+        for s in chosen:
+            covered |= self.masks[s]
+        return covered
+
+    def coversAll(self, chosen: Iterable[str]) -> bool:
+        return self.union(chosen) == self.full
+
+    def uniqueZones(self, chosen: Iterable[str]) -> int:
+        """Masque des zones couvertes par exactement un capteur de chosen."""
+        once = 0
+        twice = 0
+        for s in chosen:
+            mask = self.masks[s]
+            twice |= once & mask
+            once |= mask
+        return once & ~twice
+
+    def isElementary(self, chosen: Iterable[str]) -> bool:
+        chosen = list(chosen)
+        if not self.coversAll(chosen):
+            return False
+
+        unique = self.uniqueZones(chosen)
+        for s in chosen:
+            if not self.masks[s] & unique:
+                return False
+
+        return True
+
+    def makeElementary(self, chosen: Iterable[str], key=None) -> List[str]:
+        """
+        Retire les capteurs redondants de chosen jusqu'à obtenir une
+        configuration élémentaire. Les capteurs sont examinés dans l'ordre
+        décroissant de key (par défaut l'ordre de chosen).
+        """
+        kept = list(chosen)
+        candidates = sorted(kept, key=key, reverse=True) if key else list(kept)
+
+        for s in candidates:
+            unique = self.uniqueZones(kept)
+            if not self.masks[s] & unique:
+                kept.remove(s)
+
+        return kept
+
+
+_lastIndex = None
+
+
+def coverageIndex(M: int, sensors: Dict[str, Dict[str, object]]) -> CoverageIndex:
+    """Renvoie l'index de couverture de l'instance, recalculé seulement si elle change."""
+    global _lastIndex
+
+    if _lastIndex is None or _lastIndex[0] is not sensors or _lastIndex[1].M != M:
+        _lastIndex = (sensors, CoverageIndex(M, sensors))
+
+    return _lastIndex[1]
+
+
+_lastInstance = None
+
+
+def instanceOf(M: int, sensors: Dict[str, Dict[str, object]]) -> Instance:
+    """
+    Renvoie l'Instance de sensors : celle de la vue renvoyée par le reader,
+    sensors lui-même si c'en est une, sinon une Instance construite depuis
+    le dictionnaire (mémorisée tant que l'instance ne change pas).
+    """
+    global _lastInstance
+
+    if isinstance(sensors, Instance):
+        return sensors
+    instance = getattr(sensors, "instance", None)
+    if isinstance(instance, Instance) and instance.M == M:
+        return instance
+
+    if _lastInstance is None or _lastInstance[0] is not sensors or _lastInstance[1].M != M:
+        _lastInstance = (sensors, Instance.fromSensors(M, len(sensors), sensors))
+
+    return _lastInstance[1]
+
+
+def upperBound(M: int, sensors: Dict[str, Dict[str, object]]) -> float:
+    """
+    Majorant de la durée de vie du réseau : une zone ne peut pas être
+    surveillée plus longtemps que la somme des durées de vie des capteurs qui
+    la couvrent. Renvoie le minimum de cette somme sur les zones (0 si une
+    zone n'est couverte par aucun capteur).
+    """
+    index = coverageIndex(M, sensors)
+    totals = [0.0] * M
+
+    for s, mask in index.masks.items():
+        life = sensors[s]["life"]
+        while mask:
+            low = mask & -mask
+            totals[low.bit_length() - 1] += life
+            mask ^= low
+
+    return min(totals) if totals else 0.0
+
+
+class PoolValidation:
+    """
+    Résultat de validatePool pour une liste de configurations :
+    - covers[i], elementary[i] : 1 si la configuration i couvre toutes les
+      zones / est élémentaire, 0 sinon (bytearray, un octet par configuration)
+    - uncovered[i] : masque des zones que la configuration i ne couvre pas
+      (seulement pour celles qui ne couvrent pas tout)
+    - redundant[i] : capteurs de la configuration i qui ne sont seuls à
+      couvrir aucune zone (seulement pour celles qui en ont)
+    """
+
+    def __init__(self, count: int):
+        self.covers = bytearray(count)
+        self.elementary = bytearray(count)
+        self.uncovered: Dict[int, int] = {}
+        self.redundant: Dict[int, List] = {}
+
+    @property
+    def valid(self) -> bool:
+        return all(self.elementary)
+
+    def invalid(self) -> List[int]:
+        """Indices des configurations non élémentaires."""
+        return [i for i, ok in enumerate(self.elementary) if not ok]
+
+    def describe(self, configs: List, limit: int = 10) -> str:
+        """Diagnostic des configurations invalides (les limit premières), une par ligne."""
+        invalid = self.invalid()
+        lines = [f"{len(invalid)} invalid configs out of {len(configs)}"]
+        for i in invalid[:limit]:
+            problems = []
+            if i in self.uncovered:
+                zones = []
+                mask = self.uncovered[i]
+                while mask:
+                    low = mask & -mask
+                    zones.append(f"z{low.bit_length()}")
+                    mask ^= low
+                problems.append(f"uncovered zones {', '.join(zones)}")
+            if i in self.redundant:
+                sensors = [s if isinstance(s, str) else Instance.sensorId(s) for s in self.redundant[i]]
+                problems.append(f"redundant sensors {', '.join(sensors)}")
+            lines.append(f"config {i} {list(configs[i])} : {' ; '.join(problems)}")
+        if len(invalid) > limit:
+            lines.append(f"... and {len(invalid) - limit} more")
+        return "\n".join(lines)
+
+
+def validatePool(M: int, sensors: Dict[str, Dict[str, object]], configs: Iterable) -> PoolValidation:
+    """
+    Vérifie toutes les configurations d'un pool en une passe chacune : les
+    masques des zones couvertes au moins une fois et au moins deux fois
+    donnent à la fois la couverture et, par les zones couvertes une seule
+    fois, les capteurs redondants (cf. CoverageIndex.uniqueZones). Ne
+    s'arrête pas à la première configuration invalide.
+
+    Si sensors est une Instance, les configurations sont des séquences
+    d'indices de capteurs, sinon des listes de "s{i}".
+    """
+    configs = configs if isinstance(configs, list) else list(configs)
+    if isinstance(sensors, Instance):
+        masks = sensors.masks
+        full = sensors.full
+    else:
+        index = coverageIndex(M, sensors)
+        masks = index.masks
+        full = index.full
+
+    report = PoolValidation(len(configs))
+    covers = report.covers
+    elementary = report.elementary
+    for i, config in enumerate(configs):
+        once = 0
+        twice = 0
+        for s in config:
+            mask = masks[s]
+            twice |= once & mask
+            once |= mask
+        unique = once & ~twice
+
+        redundant = None
+        if not all(masks[s] & unique for s in config):
+            redundant = report.redundant[i] = [s for s in config if not masks[s] & unique]
+        if once == full:
+            covers[i] = 1
+            elementary[i] = redundant is None
+        else:
+            report.uncovered[i] = full & ~once
+
+    return report
+
+
 def sortByNbCoveredZones(sensors):
     sortedByNbCoveredZones = []
 
     for s in sensors :
         sortedByNbCoveredZones.append(s)
-    
+
     def coveredZonesKey(s):
         return len(sensors[s]["coverage"])
 
@@ -12,23 +251,7 @@ def sortByNbCoveredZones(sensors):
     return sortedByNbCoveredZones
 
 def coversAll(M,N,sensors,chosen):
-    notCovered = {f"z{i+1}" for i in range(M)}
-
-    for s in chosen :
-        for cov in sensors[s]["coverage"] :
-            if(cov in notCovered) :
-                notCovered.remove(cov)
-
-    return len(notCovered) == 0
+    return coverageIndex(M,sensors).coversAll(chosen)
 
 def isElementary(M,N,sensors,chosen):
-    if not coversAll(M,N,sensors,chosen):
-        return False
-
-    for i in range(len(chosen)):
-        copy = [s for s in chosen]
-        copy.pop(i)
-        if coversAll(M,N,sensors,copy):
-            return False
-    
-    return True
\ No newline at end of file
+    return coverageIndex(M,sensors).isElementary(chosen)